@@ -1,5 +1,6 @@
 import time
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional
 
 from ollama import chat
 
@@ -14,10 +15,13 @@ from src.infra.config.retry import retry_with_backoff
 class OllamaChatAdapter(ChatRepository):
     """Adapter para comunicação com Ollama."""
 
+    # Janela de métricas mantidas em memória; as mais antigas são descartadas
+    _MAX_METRICS = 10_000
+
     def __init__(self):
         """Inicializa o adapter Ollama com configurações opcionais."""
         self.__logger = LoggingConfig.get_logger(__name__)
-        self.__metrics: List[ChatMetrics] = []
+        self.__metrics: Deque[ChatMetrics] = deque(maxlen=self._MAX_METRICS)
 
         # Carrega configurações opcionais do ambiente
         self.__host = EnvironmentConfig.get_env("OLLAMA_HOST", "http://localhost:11434")
@@ -99,7 +103,7 @@ class OllamaChatAdapter(ChatRepository):
         Raises:
             ChatException: Se houver erro na comunicação
         """
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
             self.__logger.debug(f"Iniciando chat com modelo {model} no Ollama")
@@ -117,12 +121,10 @@ class OllamaChatAdapter(ChatRepository):
                 self.__logger.warning("Ollama retornou resposta vazia")
                 raise ChatException("Ollama retornou uma resposta vazia")
 
-            latency = (time.time() - start_time) * 1000
-
             tokens_info = response.get("eval_count", None)
 
-            metrics = ChatMetrics(
-                model=model, latency_ms=latency, tokens_used=tokens_info, success=True
+            metrics = ChatMetrics.from_monotonic_ns(
+                model=model, start_ns=start_ns, tokens_used=tokens_info, success=True
             )
             self.__metrics.append(metrics)
 
@@ -132,20 +134,18 @@ class OllamaChatAdapter(ChatRepository):
             return content
 
         except ChatException:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 success=False,
                 error_message="Ollama retornou resposta vazia",
             )
             self.__metrics.append(metrics)
             raise
         except KeyError as e:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 success=False,
                 error_message=f"Chave ausente: {str(e)}",
             )
@@ -158,10 +158,9 @@ class OllamaChatAdapter(ChatRepository):
                 original_error=e,
             )
         except TypeError as e:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 success=False,
                 error_message=f"Erro de tipo: {str(e)}",
             )
@@ -174,9 +173,8 @@ class OllamaChatAdapter(ChatRepository):
                 original_error=e,
             )
         except Exception as e:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
-                model=model, latency_ms=latency, success=False, error_message=str(e)
+            metrics = ChatMetrics.from_monotonic_ns(
+                model=model, start_ns=start_ns, success=False, error_message=str(e)
             )
             self.__metrics.append(metrics)
             self.__logger.error(f"Erro ao comunicar com Ollama: {str(e)}")
@@ -185,4 +183,4 @@ class OllamaChatAdapter(ChatRepository):
             )
 
     def get_metrics(self) -> List[ChatMetrics]:
-        return self.__metrics.copy()
+        return list(self.__metrics)
@@ -1,10 +1,45 @@
+import threading
+from typing import Dict
+
 from openai import OpenAI
 
 
 class ClientOpenAI:
+    """
+    Fornece clientes OpenAI reutilizáveis.
+
+    Um cliente por API key é mantido em cache, compartilhando o pool de
+    conexões HTTP entre todos os adapters que usam a mesma chave. O cache
+    guarda no máximo MAX_CLIENTS chaves; ao exceder, a mais antiga é
+    descartada (adapters que já a usam mantêm seu cliente).
+    """
+
     API_OPENAI_NAME = "OPENAI_API_KEY"
+    MAX_CLIENTS = 8
+
+    _clients: Dict[str, OpenAI] = {}
+    _lock: threading.Lock = threading.Lock()
 
     @staticmethod
     def get_client(api_key: str) -> OpenAI:
-        client = OpenAI(api_key=api_key)
+        client = ClientOpenAI._clients.get(api_key)
+        if client is not None:
+            return client
+
+        with ClientOpenAI._lock:
+            # Double-checked locking
+            client = ClientOpenAI._clients.get(api_key)
+            if client is None:
+                client = OpenAI(api_key=api_key)
+                ClientOpenAI._clients[api_key] = client
+                # Dict preserva a ordem de inserção: o primeiro é o mais antigo
+                if len(ClientOpenAI._clients) > ClientOpenAI.MAX_CLIENTS:
+                    del ClientOpenAI._clients[next(iter(ClientOpenAI._clients))]
+
         return client
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Descarta os clientes em cache. Thread-safe."""
+        with cls._lock:
+            cls._clients.clear()
@@ -1,5 +1,8 @@
 import time
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from openai import RateLimitError
 
 from src.application.interfaces.chat_repository import ChatRepository
 from src.domain.exceptions import ChatException
@@ -7,21 +10,61 @@ from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
 from src.infra.config.environment import EnvironmentConfig
 from src.infra.config.logging_config import LoggingConfig
 from src.infra.config.metrics import ChatMetrics
+from src.infra.config.rate_limiter import RateLimiter
 from src.infra.config.retry import retry_with_backoff
 
 
+def _retry_after_seconds(error: RateLimitError) -> Optional[float]:
+    """
+    Lê o prazo pedido pela OpenAI nos headers de um 429.
+
+    Aceita retry-after-ms e retry-after em segundos; a forma HTTP-date
+    de Retry-After é ignorada.
+
+    Returns:
+        Segundos a esperar, ou None se o header estiver ausente ou inválido
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for name, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        try:
+            return max(float(headers[name]) / scale, 0.0)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
 class OpenAIChatAdapter(ChatRepository):
     """Adapter para comunicação com OpenAI API."""
 
+    # Janela de métricas mantidas em memória; as mais antigas são descartadas
+    _MAX_METRICS = 10_000
+
     def __init__(self):
         """Inicializa o adapter carregando as credenciais."""
         self.__logger = LoggingConfig.get_logger(__name__)
-        self.__metrics: List[ChatMetrics] = []
+        self.__metrics: Deque[ChatMetrics] = deque(maxlen=self._MAX_METRICS)
 
         # Configurações de timeout e retry
         self.__timeout = int(EnvironmentConfig.get_env("OPENAI_TIMEOUT", "30"))
         self.__max_retries = int(EnvironmentConfig.get_env("OPENAI_MAX_RETRIES", "3"))
 
+        # Rate limit local opcional, por modelo (o factory mantém um adapter
+        # por modelo). Desativado se OPENAI_REQUESTS_PER_MINUTE não estiver
+        # definida ou for 0; OPENAI_TOKENS_PER_MINUTE = 0 desativa só o
+        # limite de tokens
+        requests_per_minute = int(
+            EnvironmentConfig.get_env("OPENAI_REQUESTS_PER_MINUTE", "0")
+        )
+        tokens_per_minute = int(
+            EnvironmentConfig.get_env("OPENAI_TOKENS_PER_MINUTE", "0")
+        )
+        self.__rate_limiter: Optional[RateLimiter] = None
+        if requests_per_minute > 0:
+            self.__rate_limiter = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute or None,
+            )
+
         try:
             api_key = EnvironmentConfig.get_api_key(ClientOpenAI.API_OPENAI_NAME)
             self.__client = ClientOpenAI.get_client(api_key)
@@ -42,6 +85,7 @@ class OpenAIChatAdapter(ChatRepository):
         max_tokens: Optional[int],
         top_p: Optional[float],
         stop: Optional[List[str]],
+        estimated_tokens: int = 0,
     ) -> Any:
         """
         Chama a API da OpenAI com retry automático.
@@ -53,6 +97,7 @@ class OpenAIChatAdapter(ChatRepository):
             max_tokens: Máximo de tokens na resposta
             top_p: Top-p sampling
             stop: Sequências de parada
+            estimated_tokens: Tokens reservados no rate limiter a cada tentativa
 
         Returns:
             Resposta da API
@@ -72,7 +117,20 @@ class OpenAIChatAdapter(ChatRepository):
         if stop is not None:
             kwargs["stop"] = stop
 
-        return self.__client.chat.completions.create(**kwargs)
+        if self.__rate_limiter is None:
+            return self.__client.chat.completions.create(**kwargs)
+
+        waited = self.__rate_limiter.acquire(estimated_tokens)
+        if waited > 0:
+            self.__logger.debug(f"Rate limit local: aguardou {waited:.2f}s")
+
+        try:
+            return self.__client.chat.completions.create(**kwargs)
+        except RateLimitError as e:
+            # A OpenAI já recusou: esvazia os baldes e respeita o Retry-After,
+            # para que o retry espere a recarga
+            self.__rate_limiter.drain(_retry_after_seconds(e))
+            raise
 
     def chat(
         self,
@@ -104,7 +162,7 @@ class OpenAIChatAdapter(ChatRepository):
         Raises:
             ChatException: Se houver erro na comunicação
         """
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
             self.__logger.debug(f"Iniciando chat com modelo {model}")
@@ -114,9 +172,20 @@ class OpenAIChatAdapter(ChatRepository):
             messages.extend(history)
             messages.append({"role": "user", "content": user_ask})
 
+            # Estimativa grosseira (~4 caracteres por token) mais a saída
+            # máxima; calculada uma vez, fora do método com retry. Conteúdo
+            # que não é str entra pela sua representação, sem recusar a
+            # requisição
+            estimated_tokens = 0
+            if self.__rate_limiter is not None:
+                estimated_tokens = (
+                    sum(len(str(m.get("content") or "")) for m in messages) // 4
+                )
+                estimated_tokens += max_tokens or 0
+
             # Chama a API da OpenAI com retry automático
             response = self.__call_openai_api(
-                model, messages, temperature, max_tokens, top_p, stop
+                model, messages, temperature, max_tokens, top_p, stop, estimated_tokens
             )
 
             content = response.choices[0].message.content
@@ -126,14 +195,13 @@ class OpenAIChatAdapter(ChatRepository):
                 raise ChatException("OpenAI retornou uma resposta vazia")
 
             # Captura métricas
-            latency = (time.time() - start_time) * 1000
             tokens_used = getattr(response.usage, "total_tokens", None)
             prompt_tokens = getattr(response.usage, "prompt_tokens", None)
             completion_tokens = getattr(response.usage, "completion_tokens", None)
 
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 tokens_used=tokens_used,
                 prompt_tokens=prompt_tokens,
                 completion_tokens=completion_tokens,
@@ -147,20 +215,18 @@ class OpenAIChatAdapter(ChatRepository):
             return content
 
         except ChatException:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 success=False,
                 error_message="OpenAI retornou resposta vazia",
             )
             self.__metrics.append(metrics)
             raise
         except AttributeError as e:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 success=False,
                 error_message=f"Erro ao acessar resposta: {str(e)}",
             )
@@ -170,10 +236,9 @@ class OpenAIChatAdapter(ChatRepository):
                 f"Erro ao acessar resposta da OpenAI: {str(e)}", original_error=e
             )
         except IndexError as e:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
+            metrics = ChatMetrics.from_monotonic_ns(
                 model=model,
-                latency_ms=latency,
+                start_ns=start_ns,
                 success=False,
                 error_message=f"Formato inesperado: {str(e)}",
             )
@@ -183,9 +248,8 @@ class OpenAIChatAdapter(ChatRepository):
                 f"Resposta da OpenAI com formato inesperado: {str(e)}", original_error=e
             )
         except Exception as e:
-            latency = (time.time() - start_time) * 1000
-            metrics = ChatMetrics(
-                model=model, latency_ms=latency, success=False, error_message=str(e)
+            metrics = ChatMetrics.from_monotonic_ns(
+                model=model, start_ns=start_ns, success=False, error_message=str(e)
             )
             self.__metrics.append(metrics)
             self.__logger.error(f"Erro ao comunicar com OpenAI: {str(e)}")
@@ -194,4 +258,4 @@ class OpenAIChatAdapter(ChatRepository):
             )
 
     def get_metrics(self) -> List[ChatMetrics]:
-        return self.__metrics.copy()
+        return list(self.__metrics)
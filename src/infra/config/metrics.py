@@ -6,15 +6,107 @@ métricas de performance e uso dos adapters de chat.
 """
 
 import json
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional
+import math
+import os
+import tempfile
+import threading
+import time
+from array import array
+from dataclasses import InitVar, dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Iterable, Optional, Union
 
+# Buffer de escrita dos exports (64 KiB): o conteúdo inteiro é gravado
+# em poucas syscalls em vez de uma por bloco padrão.
+_WRITE_BUFFER_SIZE = 1 << 16
 
-@dataclass
+# Tamanho máximo de error_message retido por métrica; evita que rajadas
+# de erros com tracebacks longos inflem a memória do coletor.
+_MAX_ERROR_MESSAGE_LENGTH = 512
+
+# umask do processo, lida uma vez na importação (os.umask só pode ser
+# lido trocando o valor); define o modo de exports novos.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Glifos de status usados em ChatMetrics.__str__
+_OK = "✓"
+_FAIL = "✗"
+
+
+def _write_atomic(filepath: Union[str, os.PathLike], content: str) -> None:
+    """
+    Grava o conteúdo em um arquivo temporário e o publica com os.replace.
+
+    Leitores (ex: scrapers do Prometheus) nunca observam um arquivo
+    parcialmente escrito: veem o conteúdo antigo ou o novo por completo.
+
+    Args:
+        filepath: Caminho final do arquivo
+        content: Conteúdo a ser gravado
+    """
+    # Nome temporário único no mesmo diretório: exports simultâneos para
+    # o mesmo caminho não compartilham (nem apagam) o arquivo um do outro
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.fspath(filepath)) or ".", suffix=".tmp"
+    )
+    try:
+        with open(fd, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(content)
+        # mkstemp cria o arquivo como 0600; aplica o modo que open()
+        # daria: o do export existente ou 0666 menos a umask
+        try:
+            mode = os.stat(filepath).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class _DerivedTimestamp(datetime):
+    """
+    datetime lido de ChatMetrics.timestamp.
+
+    Marca o valor que dataclasses.replace() devolve ao InitVar
+    "timestamp": nesse caso o timestamp_ns recebido prevalece.
+    """
+
+
+class _TimestampAccessor:
+    """
+    Acessor de ChatMetrics.timestamp.
+
+    Lido na classe, devolve None, que o dataclass usa como padrão do
+    InitVar "timestamp"; lido na instância, devolve o datetime derivado
+    de timestamp_ns e timestamp_tz.
+    """
+
+    def __get__(self, instance: Optional["ChatMetrics"], owner: Any = None) -> Any:
+        if instance is None:
+            return None
+        ns = instance.timestamp_ns
+        return _DerivedTimestamp.fromtimestamp(
+            ns // 1_000_000_000, instance.timestamp_tz
+        ).replace(microsecond=ns // 1_000 % 1_000_000)
+
+
+def _datetime_to_ns(value: datetime) -> int:
+    """Converte um datetime (naive = hora local) em ns desde a época, sem float."""
+    aware = value if value.tzinfo is not None else value.astimezone()
+    return (aware - _EPOCH) // timedelta(microseconds=1) * 1_000
+
+
+@dataclass(frozen=True, slots=True)
 class ChatMetrics:
     """
     Métricas de uma interação de chat.
+    Imutável, para que cópias rasas das coleções sejam seguras.
 
     Attributes:
         model: Nome do modelo utilizado
@@ -22,9 +114,15 @@ class ChatMetrics:
         tokens_used: Total de tokens utilizados (se disponível)
         prompt_tokens: Tokens do prompt (se disponível)
         completion_tokens: Tokens da resposta (se disponível)
-        timestamp: Timestamp da requisição
+        timestamp: Timestamp da requisição (opcional; padrão: agora).
+            Convertido para timestamp_ns/timestamp_tz na construção; a
+            leitura devolve um datetime com o mesmo fuso (naive se o
+            original era naive)
         success: Se a requisição foi bem-sucedida
-        error_message: Mensagem de erro (se houver)
+        error_message: Mensagem de erro (se houver, truncada em 512 caracteres)
+        timestamp_ns: Timestamp da requisição (nanossegundos desde a época);
+            tem precedência sobre um timestamp lido de outra métrica
+        timestamp_tz: Fuso do timestamp (None = hora local, naive)
     """
 
     model: str
@@ -32,9 +130,53 @@ class ChatMetrics:
     tokens_used: Optional[int] = None
     prompt_tokens: Optional[int] = None
     completion_tokens: Optional[int] = None
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: InitVar[Optional[datetime]] = _TimestampAccessor()
     success: bool = True
     error_message: Optional[str] = None
+    timestamp_ns: Optional[int] = None
+    timestamp_tz: Optional[tzinfo] = field(default=None, repr=False)
+
+    def __post_init__(self, timestamp: Optional[datetime]) -> None:
+        """
+        Converte um timestamp explícito e trunca error_message para
+        limitar a memória retida.
+        """
+        # Um datetime explícito vence, exceto o lido de .timestamp que
+        # replace() repassa junto com o timestamp_ns da métrica original
+        if timestamp is not None and (
+            self.timestamp_ns is None or not isinstance(timestamp, _DerivedTimestamp)
+        ):
+            object.__setattr__(self, "timestamp_ns", _datetime_to_ns(timestamp))
+            object.__setattr__(self, "timestamp_tz", timestamp.tzinfo)
+        elif self.timestamp_ns is None:
+            object.__setattr__(self, "timestamp_ns", time.time_ns())
+        if self.error_message and len(self.error_message) > _MAX_ERROR_MESSAGE_LENGTH:
+            object.__setattr__(
+                self,
+                "error_message",
+                self.error_message[:_MAX_ERROR_MESSAGE_LENGTH] + "…",
+            )
+
+    @classmethod
+    def from_monotonic_ns(
+        cls, model: str, start_ns: int, **kwargs: Any
+    ) -> "ChatMetrics":
+        """
+        Cria métricas medindo a latência a partir de um time.monotonic_ns().
+
+        Forma preferida de registrar latência: uma subtração inteira e uma
+        divisão, imune a ajustes do relógio de parede.
+
+        Args:
+            model: Nome do modelo utilizado
+            start_ns: Valor de time.monotonic_ns() no início da requisição
+            **kwargs: Demais campos de ChatMetrics
+
+        Returns:
+            ChatMetrics: Métricas com latency_ms calculada
+        """
+        latency_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return cls(model=model, latency_ms=latency_ms, **kwargs)
 
     def to_dict(self) -> dict:
         """Converte métricas para dicionário."""
@@ -52,43 +194,97 @@ class ChatMetrics:
     def __str__(self) -> str:
         """String representation das métricas."""
         tokens_info = f", tokens={self.tokens_used}" if self.tokens_used else ""
-        status = "✓" if self.success else "✗"
-        return f"[{status}] {self.model}: {self.latency_ms:.2f}ms{tokens_info}"
+        return (
+            f"[{_OK if self.success else _FAIL}] "
+            f"{self.model}: {self.latency_ms:.2f}ms{tokens_info}"
+        )
 
 
 class MetricsCollector:
     """
     Coletor de métricas para análise agregada.
+
+    add() é um único list.append, atômico sob o GIL: várias threads
+    podem registrar métricas sem lock e sem perder registros.
+
+    get_summary agrega colunas numéricas contíguas (latência, tokens e
+    sucesso) em vez de percorrer atributos de cada objeto. As colunas
+    são derivadas sob demanda, sob o lock, apenas das métricas
+    adicionadas desde a última agregação.
     """
 
     def __init__(self):
         self._metrics: list[ChatMetrics] = []
+        self._latencies = array("d")
+        self._tokens = array("q")
+        self._successes = bytearray()
+        self._lock = threading.Lock()
 
     def add(self, metrics: ChatMetrics) -> None:
-        """Adiciona métricas à coleção."""
+        """Adiciona métricas à coleção. Não adquire lock."""
         self._metrics.append(metrics)
 
+    def add_many(self, metrics: Iterable[ChatMetrics]) -> None:
+        """
+        Adiciona várias métricas com um único list.extend, sem lock.
+
+        Para lotes; uma métrica avulsa deve usar add().
+
+        Args:
+            metrics: Métricas a serem adicionadas
+        """
+        self._metrics.extend(metrics)
+
+    def _sync_columns(self) -> None:
+        """
+        Estende as colunas com as métricas ainda não agregadas.
+        Deve ser chamado com o lock adquirido.
+        """
+        # _metrics só cresce entre dois clear(), que troca a lista e as
+        # colunas juntos sob o lock; o slice é atômico sob o GIL
+        pending = self._metrics[len(self._successes) :]
+        if not pending:
+            return
+        self._latencies.extend(m.latency_ms for m in pending)
+        self._tokens.extend(m.tokens_used or 0 for m in pending)
+        self._successes.extend(m.success for m in pending)
+
     def get_all(self) -> list[ChatMetrics]:
         """Retorna todas as métricas coletadas."""
-        return self._metrics.copy()
+        with self._lock:
+            return self._metrics.copy()
 
     def get_summary(self) -> dict:
         """Retorna resumo estatístico das métricas."""
-        if not self._metrics:
+        with self._lock:
+            self._sync_columns()
+            # Cópias rasas (memcpy) para agregar fora da seção crítica
+            latencies = self._latencies[:]
+            tokens = self._tokens[:]
+            successes = bytes(self._successes)
+
+        total_requests = len(latencies)
+        if not total_requests:
             return {"total_requests": 0}
 
-        total_requests = len(self._metrics)
-        successful = sum(1 for m in self._metrics if m.success)
-        failed = total_requests - successful
+        successful = successes.count(1)
+        total_tokens = sum(tokens)
 
-        latencies = [m.latency_ms for m in self._metrics]
-        avg_latency = sum(latencies) / len(latencies)
+        # Todas as passadas rodam em C (min, max, fsum, dist)
         min_latency = min(latencies)
         max_latency = max(latencies)
-
-        total_tokens = sum(
-            m.tokens_used for m in self._metrics if m.tokens_used is not None
-        )
+        if min_latency == max_latency:
+            # Série constante: evita resíduo de arredondamento na média
+            avg_latency = min_latency
+            stddev_latency = 0.0
+        else:
+            avg_latency = math.fsum(latencies) / total_requests
+            # Duas passadas: distância euclidiana até a média, estável ao
+            # contrário de E[x²] - média²
+            stddev_latency = math.dist(
+                latencies, [avg_latency] * total_requests
+            ) / math.sqrt(total_requests)
+        failed = total_requests - successful
 
         return {
             "total_requests": total_requests,
@@ -98,18 +294,33 @@ class MetricsCollector:
             "avg_latency_ms": avg_latency,
             "min_latency_ms": min_latency,
             "max_latency_ms": max_latency,
+            "stddev_latency_ms": stddev_latency,
             "total_tokens": total_tokens,
         }
 
     def clear(self) -> None:
-        self._metrics.clear()
+        """
+        Remove todas as métricas coletadas.
 
-    def export_json(self, filepath: Optional[str] = None) -> str:
+        Os buffers são trocados por novos sob o lock; a liberação dos
+        objetos antigos acontece depois, fora da seção crítica. Uma
+        métrica adicionada concorrentemente ao clear() pode ser
+        descartada junto com as antigas.
+        """
+        with self._lock:
+            drained = self._metrics
+            self._metrics = []
+            self._latencies = array("d")
+            self._tokens = array("q")
+            self._successes = bytearray()
+        del drained
+
+    def export_json(self, filepath: Optional[Union[str, os.PathLike]] = None) -> str:
         """
         Exporta métricas em formato JSON.
 
         Args:
-            filepath: Caminho do arquivo para salvar (opcional).
+            filepath: Caminho do arquivo para salvar (str ou PathLike, opcional).
                      Se não fornecido, retorna apenas a string JSON.
 
         Returns:
@@ -123,8 +334,7 @@ class MetricsCollector:
         json_str = json.dumps(data, indent=2, ensure_ascii=False)
 
         if filepath:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(json_str)
+            _write_atomic(filepath, json_str)
 
         return json_str
 
@@ -206,13 +416,12 @@ class MetricsCollector:
 
         return "\n".join(lines)
 
-    def export_prometheus_to_file(self, filepath: str) -> None:
+    def export_prometheus_to_file(self, filepath: Union[str, os.PathLike]) -> None:
         """
         Exporta métricas para arquivo no formato Prometheus.
 
         Args:
-            filepath: Caminho do arquivo para salvar
+            filepath: Caminho do arquivo para salvar (str ou PathLike)
         """
         content = self.export_prometheus()
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        _write_atomic(filepath, content)
@@ -0,0 +1,120 @@
+"""
+Rate limiting proativo com token bucket.
+
+Fornece um limitador thread-safe que segura as requisições antes que
+o provider as rejeite com 429, evitando tempestades de retry.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket thread-safe para requisições e tokens por minuto.
+
+    Cada balde começa cheio e se recarrega continuamente na taxa
+    configurada. acquire() bloqueia até haver capacidade em ambos.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            requests_per_minute: Requisições permitidas por minuto
+            tokens_per_minute: Tokens permitidos por minuto (None desativa)
+
+        Raises:
+            ValueError: Se algum limite não for maior que zero
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute deve ser maior que zero")
+        if tokens_per_minute is not None and tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute deve ser maior que zero")
+
+        self._request_capacity = float(requests_per_minute)
+        self._token_capacity = (
+            float(tokens_per_minute) if tokens_per_minute is not None else None
+        )
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity or 0.0
+        self._last_refill = time.monotonic()
+        # Instante (monotonic) antes do qual nada é liberado; vem do
+        # Retry-After do provider em drain()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Recarrega os baldes proporcionalmente ao tempo decorrido."""
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(
+            self._request_capacity,
+            self._requests + elapsed * self._request_capacity / 60.0,
+        )
+        if self._token_capacity is not None:
+            self._tokens = min(
+                self._token_capacity,
+                self._tokens + elapsed * self._token_capacity / 60.0,
+            )
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Reserva uma requisição e os tokens estimados, esperando se preciso.
+
+        Pedidos maiores que a capacidade do balde de tokens são limitados
+        à capacidade, para não bloquearem para sempre.
+
+        Args:
+            tokens: Estimativa de tokens consumidos pela requisição
+
+        Returns:
+            Tempo total de espera em segundos
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = max(0.0, 1.0 - self._requests) * 60.0 / self._request_capacity
+                wait = max(wait, self._blocked_until - now)
+
+                needed = 0.0
+                if self._token_capacity is not None:
+                    needed = min(float(tokens), self._token_capacity)
+                    wait = max(
+                        wait,
+                        max(0.0, needed - self._tokens) * 60.0 / self._token_capacity,
+                    )
+
+                if wait <= 0.0:
+                    self._requests -= 1.0
+                    self._tokens -= needed
+                    return waited
+
+            # Dorme fora do lock para não bloquear as outras threads
+            time.sleep(wait)
+            waited += wait
+
+    def drain(self, retry_after: Optional[float] = None) -> None:
+        """
+        Esvazia os baldes, forçando a próxima requisição a esperar a recarga.
+        Usado quando o provider já respondeu 429.
+
+        Args:
+            retry_after: Segundos pedidos pelo provider (header Retry-After);
+                nenhuma requisição é liberada antes desse prazo
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._requests = 0.0
+            self._tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
@@ -1,3 +1,4 @@
+import threading
 from typing import Dict, Literal, Tuple
 
 from src.application.interfaces.chat_repository import ChatRepository
@@ -17,9 +18,12 @@ class ChatAdapterFactory:
 
     O cache evita a criação de múltiplas instâncias do mesmo adapter,
     melhorando performance e reduzindo overhead de inicialização.
+    Cache hits não adquirem lock; apenas a criação (cache miss) é
+    serializada, garantindo uma única instância por chave.
     """
 
     _cache: Dict[Tuple[str, str], ChatRepository] = {}
+    _lock: threading.Lock = threading.Lock()
 
     @classmethod
     def create(
@@ -43,22 +47,29 @@ class ChatAdapterFactory:
         # Normaliza o model para lowercase para garantir cache correto
         cache_key = (model.lower(), provider)
 
-        # Verifica se já existe no cache
-        if cache_key in cls._cache:
-            return cls._cache[cache_key]
-
-        # Cria novo adapter baseado no provider
-        if provider == "openai":
-            adapter = OpenAIChatAdapter()
-        elif provider == "ollama":
-            adapter = OllamaChatAdapter()
-        else:
-            raise ValueError(
-                f"Provider inválido: {provider}. Use 'openai' ou 'ollama'."
-            )
-
-        # Armazena no cache
-        cls._cache[cache_key] = adapter
+        # Caminho rápido: uma única consulta ao dict, sem lock
+        adapter = cls._cache.get(cache_key)
+        if adapter is not None:
+            return adapter
+
+        with cls._lock:
+            # Double-checked locking
+            adapter = cls._cache.get(cache_key)
+            if adapter is not None:
+                return adapter
+
+            # Cria novo adapter baseado no provider
+            if provider == "openai":
+                adapter = OpenAIChatAdapter()
+            elif provider == "ollama":
+                adapter = OllamaChatAdapter()
+            else:
+                raise ValueError(
+                    f"Provider inválido: {provider}. Use 'openai' ou 'ollama'."
+                )
+
+            # Armazena no cache
+            cls._cache[cache_key] = adapter
 
         return adapter
 
@@ -68,4 +79,5 @@ class ChatAdapterFactory:
         Limpa o cache de adapters.
         Útil para testes ou quando se deseja forçar recriação.
         """
-        cls._cache.clear()
+        with cls._lock:
+            cls._cache.clear()
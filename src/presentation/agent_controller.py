@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, Dict, List, Optional, Union
 
 from src.application.dtos import ChatInputDTO
 from src.application.use_cases.chat_with_agent import ChatWithAgentUseCase
@@ -101,12 +102,14 @@ class AIAgent:
         """
         return self.__chat_use_case.get_metrics()
 
-    def export_metrics_json(self, filepath: Optional[str] = None) -> str:
+    def export_metrics_json(
+        self, filepath: Optional[Union[str, os.PathLike]] = None
+    ) -> str:
         """
         Exporta métricas em formato JSON.
 
         Args:
-            filepath: Caminho do arquivo para salvar (opcional)
+            filepath: Caminho do arquivo para salvar (str ou PathLike, opcional)
 
         Returns:
             str: String JSON com as métricas
@@ -114,17 +117,18 @@ class AIAgent:
         from src.infra.config.metrics import MetricsCollector
 
         collector = MetricsCollector()
-        for metric in self.get_metrics():
-            collector.add(metric)
+        collector.add_many(self.get_metrics())
 
         return collector.export_json(filepath)
 
-    def export_metrics_prometheus(self, filepath: Optional[str] = None) -> str:
+    def export_metrics_prometheus(
+        self, filepath: Optional[Union[str, os.PathLike]] = None
+    ) -> str:
         """
         Exporta métricas em formato Prometheus.
 
         Args:
-            filepath: Caminho do arquivo para salvar (opcional)
+            filepath: Caminho do arquivo para salvar (str ou PathLike, opcional)
 
         Returns:
             str: Métricas no formato Prometheus
@@ -132,8 +136,7 @@ class AIAgent:
         from src.infra.config.metrics import MetricsCollector
 
         collector = MetricsCollector()
-        for metric in self.get_metrics():
-            collector.add(metric)
+        collector.add_many(self.get_metrics())
 
         metrics_text = collector.export_prometheus()
 
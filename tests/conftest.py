@@ -4,6 +4,8 @@ Configuração global do pytest.
 Este arquivo contém fixtures compartilhadas por todos os testes.
 """
 
+import functools
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
@@ -12,6 +14,53 @@ from src.application.interfaces.chat_repository import ChatRepository
 from src.domain.entities.agent_domain import Agent
 from src.domain.value_objects import History
 
+_OPENAI_ADAPTER = "src.infra.adapters.OpenAI.openai_chat_adapter"
+
+# Cliente único para os testes que apenas repassam o cliente ao adapter;
+# o adapter só o guarda na construção, então um object() basta
+_DUMMY_OPENAI_CLIENT = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_openai_response(content):
+    """
+    Monta a resposta do chat.completions.create, uma vez por conteúdo.
+
+    A resposta é só dado, sem introspecção de chamadas, então
+    SimpleNamespace basta no lugar de Mock. É compartilhada entre
+    testes e não deve ser alterada.
+    """
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=None,
+    )
+
+
+def _patch_openai_adapter(monkeypatch, client):
+    """Faz o OpenAIChatAdapter usar uma API key fictícia e o cliente dado."""
+    monkeypatch.setattr(
+        f"{_OPENAI_ADAPTER}.EnvironmentConfig.get_api_key", lambda name: "test-key"
+    )
+    monkeypatch.setattr(
+        f"{_OPENAI_ADAPTER}.ClientOpenAI.get_client", lambda api_key: client
+    )
+
+
+class FakeClock:
+    """Relógio virtual: sleep apenas avança o tempo, sem esperar."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def monotonic(self):
+        return self.now
+
+
 # ============================================================================
 # FIXTURES GLOBAIS
 # ============================================================================
@@ -94,13 +143,76 @@ def populated_history():
     return history
 
 
+@pytest.fixture
+def patched_openai_client(monkeypatch):
+    """
+    Substitui a API key e o cliente usados pelo OpenAIChatAdapter.
+
+    Usa atribuição direta via monkeypatch; o original é restaurado no
+    teardown. O cliente é um sentinela compartilhado, sem métodos: use
+    openai_client_mock para testes que conversam com o adapter.
+
+    Returns:
+        object: Cliente devolvido por ClientOpenAI.get_client
+    """
+    _patch_openai_adapter(monkeypatch, _DUMMY_OPENAI_CLIENT)
+    return _DUMMY_OPENAI_CLIENT
+
+
+@pytest.fixture
+def openai_client_mock(monkeypatch):
+    """
+    Cliente OpenAI falso cujo create devolve "OpenAI response".
+
+    A resposta é montada uma vez e reaproveitada. O cliente é novo a
+    cada teste, para que as chamadas registradas não vazem entre testes.
+
+    Returns:
+        Mock: Cliente OpenAI devolvido por ClientOpenAI.get_client
+    """
+    client = Mock()
+    client.chat.completions.create.return_value = _build_openai_response(
+        "OpenAI response"
+    )
+    _patch_openai_adapter(monkeypatch, client)
+    return client
+
+
+@pytest.fixture
+def make_openai_response():
+    """
+    Builder das respostas do chat.completions.create.
+
+    Returns:
+        Callable[[str], SimpleNamespace]: Devolve a resposta com o conteúdo dado
+    """
+    return _build_openai_response
+
+
 # ============================================================================
 # CONFIGURAÇÕES DO PYTEST
 # ============================================================================
 
 
+@pytest.fixture
+def fake_clock():
+    """
+    Relógio virtual novo por teste, ainda não instalado.
+
+    Cada módulo sobrepõe esta fixture para aplicar sleep/monotonic
+    no módulo que testa.
+
+    Returns:
+        FakeClock: Relógio parado em 0.0, sem sleeps registrados
+    """
+    return FakeClock()
+
+
 def pytest_configure(config):
     """Configuração executada antes dos testes."""
     config.addinivalue_line("markers", "unit: marca teste como unitário")
     config.addinivalue_line("markers", "integration: marca teste como integração")
     config.addinivalue_line("markers", "slow: marca teste como lento")
+    config.addinivalue_line("markers", "init: marca teste de inicialização")
+    config.addinivalue_line("markers", "chat: marca teste de chat")
+    config.addinivalue_line("markers", "metrics: marca teste de métricas")
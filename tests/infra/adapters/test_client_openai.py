@@ -8,16 +8,22 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
+
 
 @pytest.mark.unit
 class TestClientOpenAI:
     """Testes para ClientOpenAI."""
 
+    def setup_method(self):
+        ClientOpenAI.clear_cache()
+
+    def teardown_method(self):
+        ClientOpenAI.clear_cache()
+
     @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
     def test_get_client_creates_client_with_api_key(self, mock_openai):
         """Testa criação do cliente com API key."""
-        from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
-
         mock_client = Mock()
         mock_openai.return_value = mock_client
 
@@ -29,8 +35,6 @@ class TestClientOpenAI:
     @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
     def test_get_client_returns_openai_instance(self, mock_openai):
         """Testa que retorna instância de OpenAI."""
-        from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
-
         mock_client = Mock()
         mock_openai.return_value = mock_client
 
@@ -41,8 +45,6 @@ class TestClientOpenAI:
     @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
     def test_get_client_with_different_keys(self, mock_openai):
         """Testa criação com diferentes API keys."""
-        from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
-
         mock_client = Mock()
         mock_openai.return_value = mock_client
 
@@ -55,15 +57,11 @@ class TestClientOpenAI:
 
     def test_api_openai_name_constant(self):
         """Testa constante do nome da API key."""
-        from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
-
         assert ClientOpenAI.API_OPENAI_NAME == "OPENAI_API_KEY"
 
     @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
     def test_get_client_is_static_method(self, mock_openai):
         """Testa que get_client é método estático."""
-        from src.infra.adapters.OpenAI.client_openai import ClientOpenAI
-
         mock_client = Mock()
         mock_openai.return_value = mock_client
 
@@ -71,3 +69,36 @@ class TestClientOpenAI:
         client = ClientOpenAI.get_client("test-key")
 
         assert client is not None
+
+    @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
+    def test_get_client_reuses_client_for_same_key(self, mock_openai):
+        """Testa que a mesma API key reutiliza o cliente em cache."""
+        client1 = ClientOpenAI.get_client("test-key")
+        client2 = ClientOpenAI.get_client("test-key")
+
+        assert client1 is client2
+        mock_openai.assert_called_once_with(api_key="test-key")
+
+    @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
+    def test_clear_cache_forces_new_client(self, mock_openai):
+        """Testa que clear_cache descarta o cliente em cache."""
+        mock_openai.side_effect = lambda api_key: Mock()
+
+        client1 = ClientOpenAI.get_client("test-key")
+        ClientOpenAI.clear_cache()
+        client2 = ClientOpenAI.get_client("test-key")
+
+        assert client1 is not client2
+        assert mock_openai.call_count == 2
+
+    @patch("src.infra.adapters.OpenAI.client_openai.OpenAI")
+    def test_cache_evicts_oldest_key_beyond_max_clients(self, mock_openai):
+        """Testa que o cache não cresce além de MAX_CLIENTS chaves."""
+        mock_openai.side_effect = lambda api_key: Mock()
+        keys = [f"key-{i}" for i in range(ClientOpenAI.MAX_CLIENTS + 1)]
+
+        clients = [ClientOpenAI.get_client(key) for key in keys]
+
+        assert list(ClientOpenAI._clients) == keys[1:]
+        assert ClientOpenAI.get_client(keys[-1]) is clients[-1]
+        assert ClientOpenAI.get_client(keys[0]) is not clients[0]
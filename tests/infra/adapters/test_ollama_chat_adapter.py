@@ -2,25 +2,28 @@ from unittest.mock import patch
 
 import pytest
 
+from src.application.interfaces.chat_repository import ChatRepository
 from src.domain.exceptions import ChatException
 from src.infra.adapters.Ollama.ollama_chat_adapter import OllamaChatAdapter
 
 
+@pytest.fixture
+def adapter():
+    """Adapter novo por teste, com métricas isoladas."""
+    return OllamaChatAdapter()
+
+
 @pytest.mark.unit
 class TestOllamaChatAdapter:
     """Testes para OllamaChatAdapter."""
 
-    def test_initialization(self):
-        adapter = OllamaChatAdapter()
-
+    def test_initialization(self, adapter):
         assert adapter is not None
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_valid_input(self, mock_chat):
+    def test_chat_with_valid_input(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": "Ollama response"}}
 
-        adapter = OllamaChatAdapter()
-
         response = adapter.chat(
             model="gemma3:4b",
             instructions="Be helpful",
@@ -32,11 +35,9 @@ class TestOllamaChatAdapter:
         mock_chat.assert_called_once()
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_constructs_messages_correctly(self, mock_chat):
+    def test_chat_constructs_messages_correctly(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": "Response"}}
 
-        adapter = OllamaChatAdapter()
-
         adapter.chat(
             model="phi4-mini:latest",
             instructions="System instruction",
@@ -53,11 +54,9 @@ class TestOllamaChatAdapter:
         assert messages[2] == {"role": "user", "content": "User question"}
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_empty_history(self, mock_chat):
+    def test_chat_with_empty_history(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": "Response"}}
 
-        adapter = OllamaChatAdapter()
-
         adapter.chat(
             model="gemma3:4b",
             instructions="Instructions",
@@ -71,11 +70,9 @@ class TestOllamaChatAdapter:
         assert len(messages) == 2  # system + user
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_multiple_history_items(self, mock_chat):
+    def test_chat_with_multiple_history_items(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": "Response"}}
 
-        adapter = OllamaChatAdapter()
-
         history = [
             {"role": "user", "content": "Msg 1"},
             {"role": "assistant", "content": "Reply 1"},
@@ -96,11 +93,9 @@ class TestOllamaChatAdapter:
         assert len(messages) == 6  # system + 4 history + user
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_passes_correct_model(self, mock_chat):
+    def test_chat_passes_correct_model(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": "Response"}}
 
-        adapter = OllamaChatAdapter()
-
         adapter.chat(
             model="phi4-mini:latest",
             instructions="Test",
@@ -112,11 +107,9 @@ class TestOllamaChatAdapter:
         assert call_args.kwargs["model"] == "phi4-mini:latest"
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_empty_response_raises_error(self, mock_chat):
+    def test_chat_with_empty_response_raises_error(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": ""}}
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException, match="Ollama retornou uma resposta vazia"):
             adapter.chat(
                 model="gemma3:4b",
@@ -126,11 +119,9 @@ class TestOllamaChatAdapter:
             )
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_none_response_raises_error(self, mock_chat):
+    def test_chat_with_none_response_raises_error(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"content": None}}
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException, match="Ollama retornou uma resposta vazia"):
             adapter.chat(
                 model="phi4-mini:latest",
@@ -140,11 +131,9 @@ class TestOllamaChatAdapter:
             )
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_missing_message_key_raises_error(self, mock_chat):
+    def test_chat_with_missing_message_key_raises_error(self, mock_chat, adapter):
         mock_chat.return_value = {"wrong_key": "value"}
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException, match="formato inválido.*Chave ausente"):
             adapter.chat(
                 model="gemma3:4b",
@@ -154,11 +143,9 @@ class TestOllamaChatAdapter:
             )
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_missing_content_key_raises_error(self, mock_chat):
+    def test_chat_with_missing_content_key_raises_error(self, mock_chat, adapter):
         mock_chat.return_value = {"message": {"wrong_key": "value"}}
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException, match="formato inválido.*Chave ausente"):
             adapter.chat(
                 model="phi4-mini:latest",
@@ -168,11 +155,9 @@ class TestOllamaChatAdapter:
             )
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_type_error_raises_chat_exception(self, mock_chat):
+    def test_chat_with_type_error_raises_chat_exception(self, mock_chat, adapter):
         mock_chat.side_effect = TypeError("Invalid type")
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException, match="Erro de tipo"):
             adapter.chat(
                 model="gemma3:4b",
@@ -182,11 +167,11 @@ class TestOllamaChatAdapter:
             )
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_generic_exception_raises_chat_exception(self, mock_chat):
+    def test_chat_with_generic_exception_raises_chat_exception(
+        self, mock_chat, adapter
+    ):
         mock_chat.side_effect = RuntimeError("Connection error")
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException, match="Erro ao comunicar com Ollama"):
             adapter.chat(
                 model="phi4-mini:latest",
@@ -196,12 +181,10 @@ class TestOllamaChatAdapter:
             )
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_preserves_original_error(self, mock_chat):
+    def test_chat_preserves_original_error(self, mock_chat, adapter):
         original_error = RuntimeError("Original error")
         mock_chat.side_effect = original_error
 
-        adapter = OllamaChatAdapter()
-
         try:
             adapter.chat(
                 model="gemma3:4b",
@@ -213,12 +196,10 @@ class TestOllamaChatAdapter:
             assert e.original_error is original_error
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_propagates_chat_exception(self, mock_chat):
+    def test_chat_propagates_chat_exception(self, mock_chat, adapter):
         original_exception = ChatException("Original chat error")
         mock_chat.side_effect = original_exception
 
-        adapter = OllamaChatAdapter()
-
         with pytest.raises(ChatException) as exc_info:
             adapter.chat(
                 model="phi4-mini:latest",
@@ -229,45 +210,48 @@ class TestOllamaChatAdapter:
 
         assert exc_info.value is original_exception
 
+    @pytest.mark.parametrize(
+        "instructions, user_ask, content",
+        [
+            ("Test 你好", "Question 🎉", "Resposta com 你好 e emojis 🎉"),
+            (
+                "Multi\nline\ninstructions",
+                "Multi\nline\nquestion",
+                "Line 1\nLine 2\nLine 3",
+            ),
+        ],
+        ids=["special_characters", "multiline"],
+    )
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_special_characters(self, mock_chat):
-        mock_chat.return_value = {
-            "message": {"content": "Resposta com 你好 e emojis 🎉"}
-        }
-
-        adapter = OllamaChatAdapter()
+    def test_chat_returns_content_unchanged(
+        self, mock_chat, adapter, instructions, user_ask, content
+    ):
+        mock_chat.return_value = {"message": {"content": content}}
 
         response = adapter.chat(
-            model="phi4-mini:latest",
-            instructions="Test 你好",
-            user_ask="Question 🎉",
+            model="gemma3:4b",
+            instructions=instructions,
+            user_ask=user_ask,
             history=[],
         )
 
-        assert "你好" in response
-        assert "🎉" in response
+        assert response == content
 
     @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_chat_with_multiline_content(self, mock_chat):
-        mock_chat.return_value = {"message": {"content": "Line 1\nLine 2\nLine 3"}}
-
+    def test_metrics_keep_only_most_recent_window(self, mock_chat, monkeypatch):
+        monkeypatch.setattr(OllamaChatAdapter, "_MAX_METRICS", 2)
+        mock_chat.return_value = {"message": {"content": "Response"}}
         adapter = OllamaChatAdapter()
 
-        response = adapter.chat(
-            model="gemma3:4b",
-            instructions="Multi\nline\ninstructions",
-            user_ask="Multi\nline\nquestion",
-            history=[],
-        )
-
-        assert "\n" in response
-        assert "Line 1" in response
+        for model in ["model-a", "model-b", "model-c"]:
+            adapter.chat(model=model, instructions="Test", user_ask="Hi", history=[])
 
-    def test_adapter_implements_chat_repository_interface(self):
-        from src.application.interfaces.chat_repository import ChatRepository
+        metrics = adapter.get_metrics()
 
-        adapter = OllamaChatAdapter()
+        assert [m.model for m in metrics] == ["model-b", "model-c"]
+        assert metrics is not adapter.get_metrics()
 
+    def test_adapter_implements_chat_repository_interface(self, adapter):
         assert isinstance(adapter, ChatRepository)
         assert hasattr(adapter, "chat")
         assert callable(adapter.chat)
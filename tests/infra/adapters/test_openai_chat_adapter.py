@@ -1,11 +1,34 @@
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
+from openai import RateLimitError
 
+from src.application.interfaces.chat_repository import ChatRepository
 from src.domain.exceptions import ChatException
 from src.infra.adapters.OpenAI.openai_chat_adapter import OpenAIChatAdapter
 
 
+def _make_response(content):
+    """Resposta da API da OpenAI só com os campos lidos pelo adapter."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=None,
+    )
+
+
+@pytest.fixture
+def rate_limit_env(monkeypatch):
+    """Define OPENAI_REQUESTS_PER_MINUTE/OPENAI_TOKENS_PER_MINUTE só no teste."""
+    env = {"OPENAI_REQUESTS_PER_MINUTE": "60", "OPENAI_TOKENS_PER_MINUTE": "1000"}
+    monkeypatch.setattr(
+        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_env",
+        lambda key, default=None: env.get(key, default),
+    )
+    return env
+
+
 @pytest.mark.unit
 class TestOpenAIChatAdapter:
     """Testes para OpenAIChatAdapter."""
@@ -42,12 +65,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "OpenAI response"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response("OpenAI response")
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -73,12 +91,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Response"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response("Response")
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -107,12 +120,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Response"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response("Response")
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -138,12 +146,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Response"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response("Response")
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -176,12 +179,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Response"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response("Response")
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -207,12 +205,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = ""
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response("")
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -236,12 +229,7 @@ class TestOpenAIChatAdapter:
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = None
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+        mock_response = _make_response(None)
         mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
@@ -376,79 +364,213 @@ class TestOpenAIChatAdapter:
 
         assert exc_info.value is original_exception
 
+    @pytest.mark.parametrize(
+        "instructions, user_ask, content",
+        [
+            ("Test 你好", "Question 🎉", "Resposta com 你好 e emojis 🎉"),
+            (
+                "Multi\nline\ninstructions",
+                "Multi\nline\nquestion",
+                "Line 1\nLine 2\nLine 3",
+            ),
+        ],
+        ids=["special_characters", "multiline"],
+    )
     @patch(
         "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
     )
     @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_chat_with_special_characters(self, mock_get_client, mock_get_api_key):
+    def test_chat_returns_content_unchanged(
+        self, mock_get_client, mock_get_api_key, instructions, user_ask, content
+    ):
         mock_get_api_key.return_value = "test-api-key"
 
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Resposta com 你好 e emojis 🎉"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _make_response(content)
         mock_get_client.return_value = mock_client
 
         adapter = OpenAIChatAdapter()
 
         response = adapter.chat(
             model="gpt-5-nano",
-            instructions="Test 你好",
-            user_ask="Question 🎉",
+            instructions=instructions,
+            user_ask=user_ask,
             history=[],
         )
 
-        assert "你好" in response
-        assert "🎉" in response
+        assert response == content
 
     @patch(
         "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
     )
     @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_chat_with_multiline_content(self, mock_get_client, mock_get_api_key):
+    def test_adapter_implements_chat_repository_interface(
+        self, mock_get_client, mock_get_api_key
+    ):
         mock_get_api_key.return_value = "test-api-key"
-
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Line 1\nLine 2\nLine 3"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
-        mock_client.chat.completions.create.return_value = mock_response
         mock_get_client.return_value = mock_client
 
         adapter = OpenAIChatAdapter()
 
-        response = adapter.chat(
+        assert isinstance(adapter, ChatRepository)
+        assert hasattr(adapter, "chat")
+        assert callable(adapter.chat)
+
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.RateLimiter")
+    @patch(
+        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    )
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
+    @pytest.mark.usefixtures("rate_limit_env")
+    def test_chat_acquires_rate_limit_before_each_call(
+        self, mock_get_client, mock_get_api_key, mock_rate_limiter
+    ):
+        mock_get_api_key.return_value = "test-api-key"
+        mock_rate_limiter.return_value.acquire.return_value = 0.0
+
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = _make_response("OK")
+        mock_get_client.return_value = mock_client
+
+        adapter = OpenAIChatAdapter()
+        adapter.chat(
             model="gpt-5-nano",
-            instructions="Multi\nline\ninstructions",
-            user_ask="Multi\nline\nquestion",
+            instructions="abcd",
+            user_ask="efgh",
             history=[],
+            max_tokens=10,
         )
 
-        assert "\n" in response
-        assert "Line 1" in response
+        # (4 + 4) caracteres // 4 + max_tokens
+        mock_rate_limiter.return_value.acquire.assert_called_once_with(12)
 
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.RateLimiter")
     @patch(
         "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
     )
     @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_adapter_implements_chat_repository_interface(
-        self, mock_get_client, mock_get_api_key
+    @pytest.mark.usefixtures("rate_limit_env")
+    def test_rate_limit_error_drains_limiter(
+        self, mock_get_client, mock_get_api_key, mock_rate_limiter, monkeypatch
     ):
-        from src.application.interfaces.chat_repository import ChatRepository
+        monkeypatch.setattr("src.infra.config.retry.time.sleep", lambda _: None)
+        mock_get_api_key.return_value = "test-api-key"
+        mock_rate_limiter.return_value.acquire.return_value = 0.0
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = [
+            RateLimitError(
+                "Rate limit", response=httpx.Response(429, request=request), body=None
+            ),
+            _make_response("OK"),
+        ]
+        mock_get_client.return_value = mock_client
 
+        adapter = OpenAIChatAdapter()
+        response = adapter.chat(
+            model="gpt-5-nano", instructions="Test", user_ask="Test", history=[]
+        )
+
+        assert response == "OK"
+        mock_rate_limiter.return_value.drain.assert_called_once_with(None)
+        assert mock_rate_limiter.return_value.acquire.call_count == 2
+
+    @pytest.mark.parametrize(
+        "headers, expected",
+        [
+            ({"retry-after": "7"}, 7.0),
+            ({"retry-after-ms": "1500", "retry-after": "7"}, 1.5),
+            ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, None),
+        ],
+        ids=["seconds", "milliseconds", "http_date"],
+    )
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.RateLimiter")
+    @patch(
+        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    )
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
+    @pytest.mark.usefixtures("rate_limit_env")
+    def test_rate_limit_error_passes_retry_after_to_limiter(
+        self,
+        mock_get_client,
+        mock_get_api_key,
+        mock_rate_limiter,
+        headers,
+        expected,
+        monkeypatch,
+    ):
+        monkeypatch.setattr("src.infra.config.retry.time.sleep", lambda _: None)
         mock_get_api_key.return_value = "test-api-key"
+        mock_rate_limiter.return_value.acquire.return_value = 0.0
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        response = httpx.Response(429, headers=headers, request=request)
         mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = [
+            RateLimitError("Rate limit", response=response, body=None),
+            _make_response("OK"),
+        ]
         mock_get_client.return_value = mock_client
 
         adapter = OpenAIChatAdapter()
+        adapter.chat(
+            model="gpt-5-nano", instructions="Test", user_ask="Test", history=[]
+        )
 
-        assert isinstance(adapter, ChatRepository)
-        assert hasattr(adapter, "chat")
-        assert callable(adapter.chat)
+        mock_rate_limiter.return_value.drain.assert_called_once_with(expected)
+
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.RateLimiter")
+    @patch(
+        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    )
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
+    @pytest.mark.parametrize(
+        "env",
+        [{}, {"OPENAI_REQUESTS_PER_MINUTE": "0"}],
+        ids=["unset", "zero"],
+    )
+    def test_rate_limiter_disabled_unless_configured(
+        self, mock_get_client, mock_get_api_key, mock_rate_limiter, env, monkeypatch
+    ):
+        monkeypatch.setattr(
+            "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_env",
+            lambda key, default=None: env.get(key, default),
+        )
+        mock_get_api_key.return_value = "test-api-key"
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = _make_response("OK")
+        mock_get_client.return_value = mock_client
+
+        adapter = OpenAIChatAdapter()
+        response = adapter.chat(
+            model="gpt-5-nano", instructions="Test", user_ask="Test", history=[]
+        )
+
+        assert response == "OK"
+        mock_rate_limiter.assert_not_called()
+
+    @patch(
+        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    )
+    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
+    @pytest.mark.usefixtures("rate_limit_env")
+    def test_token_estimate_tolerates_non_string_content(
+        self, mock_get_client, mock_get_api_key
+    ):
+        mock_get_api_key.return_value = "test-api-key"
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = _make_response("OK")
+        mock_get_client.return_value = mock_client
+
+        adapter = OpenAIChatAdapter()
+        response = adapter.chat(
+            model="gpt-5-nano",
+            instructions="Test",
+            user_ask="Test",
+            history=[{"role": "assistant", "content": None}, {"role": "user"}],
+        )
+
+        assert response == "OK"
+        mock_client.chat.completions.create.assert_called_once()
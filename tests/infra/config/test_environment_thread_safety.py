@@ -7,6 +7,13 @@ import pytest
 from src.infra.config.environment import EnvironmentConfig
 
 
+@pytest.fixture(scope="module")
+def shared_executor():
+    """Pool de threads reutilizado pelos testes de concorrência do módulo."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        yield executor
+
+
 @pytest.mark.unit
 class TestEnvironmentConfigThreadSafety:
     """Testes para thread-safety do Singleton."""
@@ -39,7 +46,7 @@ class TestEnvironmentConfigThreadSafety:
 
         assert len(set(id(inst) for inst in instances)) == 1
 
-    def test_concurrent_get_env_is_safe(self):
+    def test_concurrent_get_env_is_safe(self, shared_executor):
         results = []
         lock = threading.Lock()
 
@@ -48,14 +55,13 @@ class TestEnvironmentConfigThreadSafety:
             with lock:
                 results.append(value)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            futures = [executor.submit(get_value) for _ in range(50)]
-            concurrent.futures.wait(futures)
+        futures = [shared_executor.submit(get_value) for _ in range(50)]
+        concurrent.futures.wait(futures)
 
         assert all(v == "test_value" for v in results)
         assert len(results) == 50
 
-    def test_cache_is_consistent_across_threads(self):
+    def test_cache_is_consistent_across_threads(self, shared_executor):
         EnvironmentConfig.get_env("TEST_VAR")
 
         results = []
@@ -66,13 +72,12 @@ class TestEnvironmentConfigThreadSafety:
             with lock:
                 results.append(value)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(get_cached_value) for _ in range(30)]
-            concurrent.futures.wait(futures)
+        futures = [shared_executor.submit(get_cached_value) for _ in range(30)]
+        concurrent.futures.wait(futures)
 
         assert all(v == "test_value" for v in results)
 
-    def test_get_api_key_is_thread_safe(self):
+    def test_get_api_key_is_thread_safe(self, shared_executor):
         os.environ["API_KEY_TEST"] = "secret123"
 
         results = []
@@ -87,9 +92,8 @@ class TestEnvironmentConfigThreadSafety:
                 with lock:
                     results.append(str(e))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=15) as executor:
-            futures = [executor.submit(get_key) for _ in range(40)]
-            concurrent.futures.wait(futures)
+        futures = [shared_executor.submit(get_key) for _ in range(40)]
+        concurrent.futures.wait(futures)
 
         assert all(r == "secret123" for r in results)
 
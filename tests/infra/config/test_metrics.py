@@ -1,4 +1,9 @@
-from datetime import datetime
+import json
+import os
+import threading
+from dataclasses import FrozenInstanceError, replace
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
 
@@ -43,6 +48,27 @@ class TestChatMetrics:
         assert metrics.success is False
         assert metrics.error_message == "Connection timeout"
 
+    def test_from_monotonic_ns_computes_latency(self):
+        with patch(
+            "src.infra.config.metrics.time.monotonic_ns", return_value=3_500_000
+        ):
+            metrics = ChatMetrics.from_monotonic_ns(
+                "gpt-5-nano", start_ns=1_000_000, tokens_used=10
+            )
+
+        assert metrics.latency_ms == 2.5
+        assert metrics.tokens_used == 10
+
+    def test_long_error_message_is_truncated(self):
+        metrics = ChatMetrics(
+            model="gpt-5-nano",
+            latency_ms=50.0,
+            success=False,
+            error_message="x" * 10_000,
+        )
+
+        assert metrics.error_message == "x" * 512 + "…"
+
     def test_to_dict_conversion(self):
         metrics = ChatMetrics(model="gpt-5-nano", latency_ms=150.5, tokens_used=100)
 
@@ -54,6 +80,20 @@ class TestChatMetrics:
         assert result["tokens_used"] == 100
         assert result["success"] is True
 
+    def test_to_dict_has_exact_keys(self):
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=150.5)
+
+        assert list(metrics.to_dict()) == [
+            "model",
+            "latency_ms",
+            "tokens_used",
+            "prompt_tokens",
+            "completion_tokens",
+            "timestamp",
+            "success",
+            "error_message",
+        ]
+
     def test_str_representation_success(self):
         metrics = ChatMetrics(model="gpt-5-nano", latency_ms=150.5, tokens_used=100)
 
@@ -69,10 +109,70 @@ class TestChatMetrics:
         string = str(metrics)
         assert "✗" in string
 
+    def test_metrics_are_immutable(self):
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
+
+        with pytest.raises(FrozenInstanceError):
+            metrics.latency_ms = 200.0
+
+    def test_metrics_use_slots(self):
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
+
+        assert not hasattr(metrics, "__dict__")
+
     def test_timestamp_is_auto_generated(self):
         metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
         assert isinstance(metrics.timestamp, datetime)
 
+    def test_timestamp_is_derived_from_timestamp_ns(self):
+        metrics = ChatMetrics(
+            model="gpt-5-nano", latency_ms=100.0, timestamp_ns=1_700_000_000_000_000_000
+        )
+
+        assert metrics.timestamp == datetime.fromtimestamp(1_700_000_000)
+        assert metrics.to_dict()["timestamp"] == metrics.timestamp.isoformat()
+
+    def test_timestamp_argument_is_still_accepted(self):
+        timestamp = datetime(2024, 1, 2, 3, 4, 5, 678_901)
+
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0, timestamp=timestamp)
+
+        assert metrics.timestamp == timestamp
+        assert metrics.to_dict()["timestamp"] == timestamp.isoformat()
+
+    def test_aware_timestamp_keeps_its_timezone(self):
+        timestamp = datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=-3)))
+
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0, timestamp=timestamp)
+
+        assert metrics.timestamp == timestamp
+        assert metrics.timestamp.utcoffset() == timedelta(hours=-3)
+        assert metrics.to_dict()["timestamp"] == "2024-01-01T12:00:00-03:00"
+
+    def test_replace_keeps_explicit_timestamp_ns(self):
+        metrics = ChatMetrics(
+            model="gpt-5-nano", latency_ms=100.0, timestamp=datetime(2024, 1, 1)
+        )
+
+        replaced = replace(metrics, timestamp_ns=1_700_000_000_123_456_789)
+
+        assert replaced.timestamp_ns == 1_700_000_000_123_456_789
+
+    def test_replace_other_field_keeps_timestamp_ns_exactly(self):
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
+
+        replaced = replace(metrics, latency_ms=200.0)
+
+        assert replaced.timestamp_ns == metrics.timestamp_ns
+
+    def test_replace_with_new_timestamp(self):
+        metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
+        timestamp = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+        replaced = replace(metrics, timestamp=timestamp)
+
+        assert replaced.timestamp == timestamp
+
 
 @pytest.mark.unit
 class TestMetricsCollector:
@@ -100,6 +200,22 @@ class TestMetricsCollector:
 
         assert len(collector.get_all()) == 5
 
+    def test_add_many_metrics(self):
+        collector = MetricsCollector()
+        batch = [
+            ChatMetrics(model="gpt-5-nano", latency_ms=100.0, tokens_used=10),
+            ChatMetrics(model="gpt-5-nano", latency_ms=300.0, success=False),
+        ]
+
+        collector.add_many(batch)
+
+        assert collector.get_all() == batch
+        summary = collector.get_summary()
+        assert summary["total_requests"] == 2
+        assert summary["failed"] == 1
+        assert summary["avg_latency_ms"] == 200.0
+        assert summary["total_tokens"] == 10
+
     def test_get_all_returns_copy(self):
         collector = MetricsCollector()
         metrics = ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
@@ -111,6 +227,56 @@ class TestMetricsCollector:
         assert list1 is not list2
         assert list1 == list2
 
+    def test_get_all_snapshot_is_not_affected_by_later_changes(self):
+        collector = MetricsCollector()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0))
+
+        snapshot = collector.get_all()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=200.0))
+        collector.clear()
+
+        assert len(snapshot) == 1
+
+    def test_concurrent_add_keeps_all_metrics(self):
+        collector = MetricsCollector()
+
+        def worker(thread_id):
+            for i in range(10):
+                collector.add(
+                    ChatMetrics(model=f"model-{thread_id}", latency_ms=float(i))
+                )
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(collector.get_all()) == 500
+        assert collector.get_summary()["total_requests"] == 500
+
+    def test_concurrent_clear_keeps_collector_consistent(self):
+        collector = MetricsCollector()
+
+        def writer():
+            for i in range(50):
+                collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=float(i)))
+
+        def cleaner():
+            for _ in range(10):
+                collector.clear()
+                collector.get_summary()
+
+        threads = [threading.Thread(target=writer) for _ in range(10)]
+        threads += [threading.Thread(target=cleaner) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        summary = collector.get_summary()
+        assert summary["total_requests"] == len(collector.get_all())
+
     def test_summary_empty_collector(self):
         collector = MetricsCollector()
         summary = collector.get_summary()
@@ -135,8 +301,55 @@ class TestMetricsCollector:
         assert summary["avg_latency_ms"] == 150.0
         assert summary["min_latency_ms"] == 100.0
         assert summary["max_latency_ms"] == 200.0
+        assert summary["stddev_latency_ms"] == pytest.approx(40.8248, rel=1e-4)
         assert summary["total_tokens"] == 225
 
+    @pytest.mark.parametrize("latency_ms", [33.3, 0.1])
+    def test_summary_stddev_of_constant_series_is_zero(self, latency_ms):
+        collector = MetricsCollector()
+        collector.add_many(
+            ChatMetrics(model="gpt-5-nano", latency_ms=latency_ms) for _ in range(1000)
+        )
+
+        summary = collector.get_summary()
+
+        assert summary["stddev_latency_ms"] == 0.0
+        assert summary["avg_latency_ms"] == latency_ms
+
+    def test_summary_stddev_is_stable_for_large_offsets(self):
+        collector = MetricsCollector()
+        collector.add_many(
+            ChatMetrics(model="gpt-5-nano", latency_ms=1e9 + offset)
+            for offset in (0.0, 1.0, 2.0)
+        )
+
+        summary = collector.get_summary()
+
+        assert summary["stddev_latency_ms"] == pytest.approx(0.816496, rel=1e-6)
+
+    def test_summary_latency_keeps_full_precision(self):
+        collector = MetricsCollector()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=1.2344))
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=2.0006))
+
+        summary = collector.get_summary()
+
+        assert summary["min_latency_ms"] == 1.2344
+        assert summary["max_latency_ms"] == 2.0006
+
+    def test_summary_includes_metrics_added_after_previous_summary(self):
+        collector = MetricsCollector()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0))
+        collector.get_summary()
+
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=300.0))
+        collector.add_many([ChatMetrics(model="gpt-5-nano", latency_ms=200.0)])
+
+        summary = collector.get_summary()
+        assert summary["total_requests"] == 3
+        assert summary["avg_latency_ms"] == 200.0
+        assert summary["max_latency_ms"] == 300.0
+
     def test_summary_with_failed_metrics(self):
         collector = MetricsCollector()
 
@@ -149,6 +362,7 @@ class TestMetricsCollector:
         assert summary["successful"] == 1
         assert summary["failed"] == 1
         assert summary["success_rate"] == 50.0
+        assert summary["total_tokens"] == 0
 
     def test_clear_collector(self):
         collector = MetricsCollector()
@@ -160,6 +374,7 @@ class TestMetricsCollector:
         collector.clear()
 
         assert len(collector.get_all()) == 0
+        assert collector.get_summary() == {"total_requests": 0}
 
     def test_export_json_returns_string(self):
         collector = MetricsCollector()
@@ -173,8 +388,6 @@ class TestMetricsCollector:
         assert "gpt-5-nano" in json_str
 
     def test_export_json_to_file(self, tmp_path):
-        import json
-
         collector = MetricsCollector()
         collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0, tokens_used=50))
 
@@ -190,6 +403,15 @@ class TestMetricsCollector:
         assert "metrics" in data
         assert data["summary"]["total_requests"] == 1
 
+    def test_export_json_accepts_pathlike(self, tmp_path):
+        collector = MetricsCollector()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0))
+
+        filepath = tmp_path / "metrics.json"
+        json_str = collector.export_json(filepath)
+
+        assert filepath.read_text(encoding="utf-8") == json_str
+
     def test_export_prometheus_format(self):
         collector = MetricsCollector()
         collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0, tokens_used=50))
@@ -218,6 +440,56 @@ class TestMetricsCollector:
 
         assert "chat_requests_total" in content
 
+    def test_export_to_file_overwrites_atomically(self, tmp_path):
+        collector = MetricsCollector()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0))
+
+        filepath = tmp_path / "metrics.prom"
+        filepath.write_text("old content", encoding="utf-8")
+
+        collector.export_prometheus_to_file(str(filepath))
+
+        assert "old content" not in filepath.read_text(encoding="utf-8")
+        assert list(tmp_path.iterdir()) == [filepath]
+
+    def test_concurrent_exports_to_same_path_publish_whole_files(self, tmp_path):
+        collector = MetricsCollector()
+        collector.add(ChatMetrics(model="gpt-5-nano", latency_ms=100.0))
+        filepath = tmp_path / "metrics.json"
+
+        threads = [
+            threading.Thread(target=collector.export_json, args=(filepath,))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert json.loads(filepath.read_text(encoding="utf-8"))["summary"]
+        assert list(tmp_path.iterdir()) == [filepath]
+
+    @pytest.mark.skipif(os.name == "nt", reason="permissões POSIX")
+    def test_export_to_new_file_respects_umask(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.infra.config.metrics._UMASK", 0o077)
+        collector = MetricsCollector()
+        filepath = tmp_path / "metrics.json"
+
+        collector.export_json(filepath)
+
+        assert filepath.stat().st_mode & 0o777 == 0o600
+
+    @pytest.mark.skipif(os.name == "nt", reason="permissões POSIX")
+    def test_export_keeps_mode_of_existing_file(self, tmp_path):
+        collector = MetricsCollector()
+        filepath = tmp_path / "metrics.prom"
+        filepath.write_text("old content", encoding="utf-8")
+        filepath.chmod(0o600)
+
+        collector.export_prometheus_to_file(filepath)
+
+        assert filepath.stat().st_mode & 0o777 == 0o600
+
     def test_export_prometheus_empty_collector(self):
         collector = MetricsCollector()
 
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from src.infra.config.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def fake_clock(fake_clock, monkeypatch):
+    monkeypatch.setattr(
+        "src.infra.config.rate_limiter.time.monotonic", fake_clock.monotonic
+    )
+    monkeypatch.setattr("src.infra.config.rate_limiter.time.sleep", fake_clock.sleep)
+    return fake_clock
+
+
+class _WouldWait(Exception):
+    """Sinaliza que acquire() teria de esperar pela recarga."""
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Testes para o token bucket RateLimiter."""
+
+    def test_burst_up_to_capacity_does_not_wait(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=60)
+
+        waits = [limiter.acquire() for _ in range(60)]
+
+        assert waits == [0.0] * 60
+        assert fake_clock.sleeps == []
+
+    def test_waits_for_request_refill_when_exhausted(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(60):
+            limiter.acquire()
+
+        waited = limiter.acquire()
+
+        assert waited == pytest.approx(1.0)
+        assert fake_clock.now == pytest.approx(1.0)
+
+    def test_requests_refill_over_time(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(60):
+            limiter.acquire()
+
+        fake_clock.now += 5.0
+
+        assert [limiter.acquire() for _ in range(5)] == [0.0] * 5
+
+    def test_waits_for_token_refill(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+        limiter.acquire(tokens=600)
+
+        waited = limiter.acquire(tokens=100)
+
+        assert waited == pytest.approx(10.0)
+
+    def test_token_request_larger_than_capacity_is_clamped(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+
+        assert limiter.acquire(tokens=10_000) == 0.0
+        assert limiter.acquire(tokens=10_000) == pytest.approx(60.0)
+
+    def test_tokens_ignored_without_token_limit(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=10)
+
+        assert limiter.acquire(tokens=1_000_000) == 0.0
+
+    def test_drain_forces_next_acquire_to_wait(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=120)
+
+        limiter.drain()
+
+        assert limiter.acquire() == pytest.approx(0.5)
+
+    def test_drain_honours_retry_after(self, fake_clock):
+        limiter = RateLimiter(requests_per_minute=120)
+
+        limiter.drain(retry_after=5.0)
+
+        # O Retry-After (5s) prevalece sobre a recarga do balde (0.5s)
+        assert limiter.acquire() == pytest.approx(5.0)
+        assert fake_clock.now == pytest.approx(5.0)
+
+    @pytest.mark.parametrize(
+        "requests_per_minute, tokens_per_minute",
+        [(0, None), (-1, None), (60, 0), (60, -10)],
+    )
+    def test_invalid_limits_raise_error(self, requests_per_minute, tokens_per_minute):
+        with pytest.raises(ValueError, match="maior que zero"):
+            RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+            )
+
+    def test_concurrent_acquire_never_exceeds_capacity(self, fake_clock, monkeypatch):
+        def refuse_to_wait(seconds):
+            raise _WouldWait
+
+        # Relógio parado: acquire() só concede o que já está no balde
+        monkeypatch.setattr("src.infra.config.rate_limiter.time.sleep", refuse_to_wait)
+        limiter = RateLimiter(requests_per_minute=100)
+        granted = []
+
+        def worker():
+            try:
+                for _ in range(50):
+                    limiter.acquire()
+                    granted.append(True)
+            except _WouldWait:
+                pass
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Sem recarga, todo o balde inicial é concedido, e nada além dele
+        assert len(granted) == 100
+        assert fake_clock.now == 0.0
@@ -1,10 +1,52 @@
-import time
-from unittest.mock import Mock, patch
+import re
+from unittest.mock import Mock
 
 import pytest
 
 from src.infra.config.retry import retry_with_backoff
 
+# Decorators compartilhados pelos testes que usam a mesma configuração
+_RETRY_3 = retry_with_backoff(max_attempts=3, initial_delay=0.0)
+_RETRY_2 = retry_with_backoff(max_attempts=2, initial_delay=0.0)
+
+
+def _flaky(n_fail, result="success", exc=None):
+    """Função que falha nas n_fail primeiras chamadas e conta em .calls."""
+    exc = exc or Exception("Error")
+
+    def func():
+        func.calls += 1
+        if func.calls <= n_fail:
+            raise exc
+        return result
+
+    func.calls = 0
+    return func
+
+
+_PERSISTENT_ERROR = re.compile("Persistent error")
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Nenhum teste espera de verdade; fake_clock sobrepõe quando usado."""
+    monkeypatch.setattr("src.infra.config.retry.time.sleep", lambda _: None)
+
+
+@pytest.fixture
+def fake_clock(fake_clock, monkeypatch):
+    monkeypatch.setattr("src.infra.config.retry.time.sleep", fake_clock.sleep)
+    return fake_clock
+
+
+@pytest.fixture
+def log_mock(monkeypatch):
+    log = Mock()
+    monkeypatch.setattr(
+        "src.infra.config.retry.LoggingConfig.get_logger", lambda name: log
+    )
+    return log
+
 
 @pytest.mark.unit
 class TestRetryWithBackoff:
@@ -23,56 +65,45 @@ class TestRetryWithBackoff:
         assert mock_func.call_count == 1
 
     def test_retry_on_exception(self):
-        mock_func = Mock(
-            side_effect=[Exception("Error 1"), Exception("Error 2"), "success"]
-        )
-
-        @retry_with_backoff(max_attempts=3, initial_delay=0.01)
-        def test_func():
-            return mock_func()
+        flaky = _flaky(n_fail=2)
+        test_func = _RETRY_3(flaky)
 
         result = test_func()
 
         assert result == "success"
-        assert mock_func.call_count == 3
+        assert flaky.calls == 3
 
     def test_max_attempts_reached_raises_exception(self):
-        mock_func = Mock(side_effect=Exception("Persistent error"))
+        flaky = _flaky(n_fail=3, exc=Exception("Persistent error"))
+        test_func = _RETRY_3(flaky)
 
-        @retry_with_backoff(max_attempts=3, initial_delay=0.01)
-        def test_func():
-            return mock_func()
-
-        with pytest.raises(Exception, match="Persistent error"):
+        with pytest.raises(Exception, match=_PERSISTENT_ERROR):
             test_func()
 
-        assert mock_func.call_count == 3
-
-    def test_backoff_delay_increases(self):
-        call_times = []
-
-        def failing_func():
-            call_times.append(time.time())
-            if len(call_times) < 3:
-                raise Exception("Error")
-            return "success"
-
-        @retry_with_backoff(max_attempts=3, initial_delay=0.1, backoff_factor=2.0)
-        def test_func():
-            return failing_func()
+        assert flaky.calls == 3
+
+    @pytest.mark.parametrize(
+        "initial_delay, backoff_factor, expected_sleeps",
+        [
+            (0.05, 2.0, [0.05, 0.1]),
+            (0.1, 2.0, [0.1, 0.2]),
+            (0.2, 2.0, [0.2, 0.4]),
+            (0.1, 3.0, [0.1, 0.3]),
+        ],
+    )
+    def test_backoff_delay_increases(
+        self, fake_clock, initial_delay, backoff_factor, expected_sleeps
+    ):
+        flaky = _flaky(n_fail=2)
+        test_func = retry_with_backoff(
+            max_attempts=3, initial_delay=initial_delay, backoff_factor=backoff_factor
+        )(flaky)
 
         result = test_func()
 
         assert result == "success"
-        assert len(call_times) == 3
-
-        if len(call_times) >= 2:
-            delay1 = call_times[1] - call_times[0]
-            assert delay1 >= 0.09
-
-        if len(call_times) >= 3:
-            delay2 = call_times[2] - call_times[1]
-            assert delay2 >= 0.18
+        assert flaky.calls == 3
+        assert fake_clock.sleeps == pytest.approx(expected_sleeps)
 
     def test_only_specified_exceptions_trigger_retry(self):
         mock_func = Mock(side_effect=ValueError("Wrong exception"))
@@ -122,7 +153,7 @@ class TestRetryWithBackoff:
     def test_function_with_arguments(self):
         mock_func = Mock(return_value="result")
 
-        @retry_with_backoff(max_attempts=2, initial_delay=0.01)
+        @_RETRY_2
         def test_func(a, b, c=None):
             return mock_func(a, b, c)
 
@@ -140,72 +171,41 @@ class TestRetryWithBackoff:
         assert test_func.__name__ == "test_func"
         assert test_func.__doc__ == "Test docstring"
 
-    def test_logging_on_retry(self):
+    def test_logging_on_retry(self, log_mock):
         mock_func = Mock(side_effect=[Exception("Error"), "success"])
 
-        with patch("src.infra.config.retry.LoggingConfig.get_logger") as mock_logger:
-            mock_log_instance = Mock()
-            mock_logger.return_value = mock_log_instance
-
-            @retry_with_backoff(max_attempts=3, initial_delay=0.01)
-            def test_func():
-                return mock_func()
+        @retry_with_backoff(max_attempts=3, initial_delay=0.01)
+        def test_func():
+            return mock_func()
 
-            result = test_func()
+        result = test_func()
 
-            assert result == "success"
-            assert mock_log_instance.warning.call_count == 1
+        assert result == "success"
+        assert log_mock.warning.call_count == 1
 
-    def test_logging_on_final_failure(self):
+    def test_logging_on_final_failure(self, log_mock):
         mock_func = Mock(side_effect=Exception("Persistent error"))
 
-        with patch("src.infra.config.retry.LoggingConfig.get_logger") as mock_logger:
-            mock_log_instance = Mock()
-            mock_logger.return_value = mock_log_instance
-
-            @retry_with_backoff(max_attempts=2, initial_delay=0.01)
-            def test_func():
-                return mock_func()
+        @retry_with_backoff(max_attempts=2, initial_delay=0.01)
+        def test_func():
+            return mock_func()
 
-            with pytest.raises(Exception):
-                test_func()
+        with pytest.raises(Exception, match=_PERSISTENT_ERROR):
+            test_func()
 
-            assert mock_log_instance.error.call_count == 1
+        assert log_mock.error.call_count == 1
 
-    def test_zero_initial_delay(self):
+    def test_zero_initial_delay(self, fake_clock):
         mock_func = Mock(side_effect=[Exception("Error"), "success"])
 
         @retry_with_backoff(max_attempts=3, initial_delay=0.0)
         def test_func():
             return mock_func()
 
-        start_time = time.time()
         result = test_func()
-        elapsed = time.time() - start_time
 
         assert result == "success"
-        assert elapsed < 0.1
-
-    def test_custom_backoff_factor(self):
-        call_times = []
-
-        def failing_func():
-            call_times.append(time.time())
-            if len(call_times) < 3:
-                raise Exception("Error")
-            return "success"
-
-        @retry_with_backoff(max_attempts=3, initial_delay=0.1, backoff_factor=3.0)
-        def test_func():
-            return failing_func()
-
-        result = test_func()
-
-        assert result == "success"
-
-        if len(call_times) >= 3:
-            delay2 = call_times[2] - call_times[1]
-            assert delay2 >= 0.28
+        assert fake_clock.sleeps == [0.0]
 
     def test_single_attempt(self):
         mock_func = Mock(side_effect=Exception("Error"))
@@ -220,25 +220,19 @@ class TestRetryWithBackoff:
         assert mock_func.call_count == 1
 
     def test_many_retries(self):
-        call_count = [0]
-
-        @retry_with_backoff(max_attempts=10, initial_delay=0.01)
-        def test_func():
-            call_count[0] += 1
-            if call_count[0] < 10:
-                raise Exception("Error")
-            return "success"
+        flaky = _flaky(n_fail=9)
+        test_func = retry_with_backoff(max_attempts=10, initial_delay=0.01)(flaky)
 
         result = test_func()
 
         assert result == "success"
-        assert call_count[0] == 10
+        assert flaky.calls == 10
 
     def test_exception_message_preserved(self):
         error_message = "Specific error message"
         mock_func = Mock(side_effect=Exception(error_message))
 
-        @retry_with_backoff(max_attempts=2, initial_delay=0.01)
+        @_RETRY_2
         def test_func():
             return mock_func()
 
@@ -265,8 +259,8 @@ class TestRetryWithBackoff:
     def test_nested_retry_decorators(self):
         call_count = [0]
 
-        @retry_with_backoff(max_attempts=2, initial_delay=0.01)
-        @retry_with_backoff(max_attempts=2, initial_delay=0.01)
+        @_RETRY_2
+        @_RETRY_2
         def test_func():
             call_count[0] += 1
             if call_count[0] < 2:
@@ -278,22 +272,11 @@ class TestRetryWithBackoff:
         assert result == "success"
         assert call_count[0] >= 2
 
-    def test_return_value_types(self):
-        test_cases = [
-            42,
-            "string",
-            [1, 2, 3],
-            {"key": "value"},
-            None,
-            True,
-        ]
-
-        for expected_value in test_cases:
-            mock_func = Mock(return_value=expected_value)
-
-            @retry_with_backoff(max_attempts=2, initial_delay=0.01)
-            def test_func():
-                return mock_func()
-
-            result = test_func()
-            assert result == expected_value
+    @pytest.mark.parametrize(
+        "expected_value",
+        [42, "string", [1, 2, 3], {"key": "value"}, None, True],
+    )
+    def test_return_value_types(self, expected_value):
+        test_func = _RETRY_2(_flaky(n_fail=0, result=expected_value))
+
+        assert test_func() == expected_value
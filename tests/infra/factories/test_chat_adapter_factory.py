@@ -1,5 +1,8 @@
+import concurrent.futures
+
 import pytest
 
+from src.application.interfaces.chat_repository import ChatRepository
 from src.infra.adapters.Ollama.ollama_chat_adapter import OllamaChatAdapter
 from src.infra.adapters.OpenAI.openai_chat_adapter import OpenAIChatAdapter
 from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
@@ -7,28 +10,15 @@ from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
 
 @pytest.mark.unit
 class TestChatAdapterFactory:
-    def test_create_openai_adapter_with_gpt5(self):
-        adapter = ChatAdapterFactory.create(provider="openai", model="gpt-5")
-
-        assert isinstance(adapter, OpenAIChatAdapter)
-
-    def test_create_openai_adapter_with_gpt5_mini(self):
-        adapter = ChatAdapterFactory.create(provider="openai", model="gpt-5-mini")
-
-        assert isinstance(adapter, OpenAIChatAdapter)
-
-    def test_create_openai_adapter_with_uppercase_gpt(self):
-        adapter = ChatAdapterFactory.create(provider="openai", model="GPT-5-NANO")
+    @pytest.mark.parametrize("model", ["gpt-5", "gpt-5-mini", "GPT-5-NANO"])
+    def test_create_openai_adapter(self, model):
+        adapter = ChatAdapterFactory.create(provider="openai", model=model)
 
         assert isinstance(adapter, OpenAIChatAdapter)
 
-    def test_create_ollama_adapter_with_phi4(self):
-        adapter = ChatAdapterFactory.create(provider="ollama", model="phi4-mini:latest")
-
-        assert isinstance(adapter, OllamaChatAdapter)
-
-    def test_create_ollama_adapter_with_gemma(self):
-        adapter = ChatAdapterFactory.create(provider="ollama", model="gemma3:4b")
+    @pytest.mark.parametrize("model", ["phi4-mini:latest", "gemma3:4b"])
+    def test_create_ollama_adapter(self, model):
+        adapter = ChatAdapterFactory.create(provider="ollama", model=model)
 
         assert isinstance(adapter, OllamaChatAdapter)
 
@@ -72,6 +62,21 @@ class TestChatAdapterFactory:
         assert isinstance(adapter1, OpenAIChatAdapter)
         assert isinstance(adapter2, OllamaChatAdapter)
 
+    def test_concurrent_create_returns_single_instance(self):
+        ChatAdapterFactory.clear_cache()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            adapters = list(
+                executor.map(
+                    lambda _: ChatAdapterFactory.create(
+                        provider="ollama", model="gemma3:4b"
+                    ),
+                    range(20),
+                )
+            )
+
+        assert all(adapter is adapters[0] for adapter in adapters)
+
     def test_clear_cache_forces_new_instances(self):
         adapter1 = ChatAdapterFactory.create(provider="openai", model="gpt-5-mini")
 
@@ -82,8 +87,6 @@ class TestChatAdapterFactory:
         assert adapter1 is not adapter2
 
     def test_factory_returns_chat_repository_interface(self):
-        from src.application.interfaces.chat_repository import ChatRepository
-
         adapter = ChatAdapterFactory.create(provider="openai", model="gpt-5")
 
         assert isinstance(adapter, ChatRepository)
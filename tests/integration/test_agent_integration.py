@@ -1,96 +1,108 @@
-from unittest.mock import Mock, patch
+from types import MappingProxyType
+from unittest.mock import Mock
 
 import pytest
 
 from src.domain.exceptions import ChatException, InvalidAgentConfigException
+from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
 from src.presentation.agent_controller import AIAgent
 
+_OPENAI_ADAPTER = "src.infra.adapters.OpenAI.openai_chat_adapter"
+_OLLAMA_ADAPTER = "src.infra.adapters.Ollama.ollama_chat_adapter"
+
+_REPLY = "Hello! How can I help you?"
+# Payload imutável do Ollama: construído uma vez e protegido contra mutação
+_OLLAMA_REPLY = MappingProxyType({"message": MappingProxyType({"content": _REPLY})})
+
+
+def _assert_configs(configs, **expected):
+    """Compara as chaves esperadas com o dicionário de get_configs()."""
+    for key, value in expected.items():
+        assert configs[key] == value, (key, configs[key], value)
+
 
 @pytest.mark.integration
 class TestAgentIntegration:
     """Testes de integração para o fluxo completo do agente."""
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_create_agent_and_chat_with_openai(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
+    @pytest.fixture(autouse=True)
+    def _reset_adapter_cache(self, monkeypatch):
+        # Cache vazio e exclusivo do teste; o original é restaurado no teardown
+        monkeypatch.setattr(ChatAdapterFactory, "_cache", {})
 
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-api-key"
+    @pytest.fixture
+    def mock_openai_client(self, monkeypatch):
+        """Cliente OpenAI falso devolvido pelo adapter, com chave fictícia."""
         mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Hello! How can I help you?"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
-        mock_client.chat.completions.create.return_value = mock_response
-        mock_get_client.return_value = mock_client
-
-        agent = AIAgent(
-            provider="openai",
-            model="gpt-5-mini",
-            name="Assistant",
-            instructions="You are a helpful assistant",
+        monkeypatch.setattr(
+            f"{_OPENAI_ADAPTER}.EnvironmentConfig.get_api_key",
+            Mock(return_value="test-api-key"),
         )
+        monkeypatch.setattr(
+            f"{_OPENAI_ADAPTER}.ClientOpenAI.get_client", Mock(return_value=mock_client)
+        )
+        return mock_client
 
-        response = agent.chat("Hello")
+    @pytest.fixture
+    def stub_provider(self, request, monkeypatch, make_openai_response):
+        """Instala o mock do provider e devolve o callable que recebe o chat."""
 
-        assert response == "Hello! How can I help you?"
-        assert mock_client.chat.completions.create.called
+        def install(provider):
+            if provider == "openai":
+                mock_client = request.getfixturevalue("mock_openai_client")
+                mock_client.chat.completions.create.return_value = make_openai_response(
+                    _REPLY
+                )
+                return mock_client.chat.completions.create
 
-    @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_create_agent_and_chat_with_ollama(self, mock_ollama_chat):
-        mock_ollama_chat.return_value = {
-            "message": {"content": "Hi there! I'm here to help."}
-        }
+            mock_ollama_chat = Mock(return_value=_OLLAMA_REPLY)
+            monkeypatch.setattr(f"{_OLLAMA_ADAPTER}.chat", mock_ollama_chat)
+            return mock_ollama_chat
+
+        return install
+
+    @pytest.mark.parametrize(
+        "provider, model", [("openai", "gpt-5-mini"), ("ollama", "gemma3:4b")]
+    )
+    def test_create_agent_and_chat(self, stub_provider, provider, model):
+        chat_call = stub_provider(provider)
 
         agent = AIAgent(
-            provider="ollama",
-            model="gemma3:4b",
-            name="Local Assistant",
-            instructions="You are a helpful local AI",
+            provider=provider,
+            model=model,
+            name="Assistant",
+            instructions="You are a helpful assistant",
         )
 
-        response = agent.chat("Hi")
+        response = agent.chat("Hello")
 
-        assert response == "Hi there! I'm here to help."
-        assert mock_ollama_chat.called
+        assert response == _REPLY
+        assert chat_call.called
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_conversation_flow_with_history(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
-
-        ChatAdapterFactory.clear_cache()
+        configs = agent.get_configs()
 
-        mock_get_api_key.return_value = "test-api-key"
-        mock_client = Mock()
+        assert "history" in configs
+        _assert_configs(
+            configs,
+            name="Assistant",
+            model=model,
+            instructions="You are a helpful assistant",
+            provider=provider,
+        )
+        assert len(configs["history"]) == 2
 
+    def test_conversation_flow_with_history(
+        self, mock_openai_client, make_openai_response
+    ):
         responses = [
             "Nice to meet you!",
             "I'm doing great, thanks!",
             "Sure, I can help with that.",
         ]
 
-        def create_mock_response(content):
-            mock_response = Mock()
-            mock_message = Mock()
-            mock_message.content = content
-            mock_choice = Mock()
-            mock_choice.message = mock_message
-            mock_response.choices = [mock_choice]
-            return mock_response
-
-        mock_client.chat.completions.create.side_effect = [
-            create_mock_response(r) for r in responses
+        mock_openai_client.chat.completions.create.side_effect = [
+            make_openai_response(r) for r in responses
         ]
-        mock_get_client.return_value = mock_client
 
         agent = AIAgent(
             provider="openai",
@@ -110,32 +122,11 @@ class TestAgentIntegration:
         configs = agent.get_configs()
         assert len(configs["history"]) == 6
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_clear_history_integration(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
-
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-api-key"
-        mock_client = Mock()
-
-        def create_mock_response(content):
-            mock_response = Mock()
-            mock_message = Mock()
-            mock_message.content = content
-            mock_choice = Mock()
-            mock_choice.message = mock_message
-            mock_response.choices = [mock_choice]
-            return mock_response
-
-        mock_client.chat.completions.create.side_effect = [
-            create_mock_response("Response 1"),
-            create_mock_response("Response 2"),
+    def test_clear_history_integration(self, mock_openai_client, make_openai_response):
+        mock_openai_client.chat.completions.create.side_effect = [
+            make_openai_response("Response 1"),
+            make_openai_response("Response 2"),
         ]
-        mock_get_client.return_value = mock_client
 
         agent = AIAgent(
             provider="openai",
@@ -153,29 +144,25 @@ class TestAgentIntegration:
         agent.chat("Message 2")
         assert len(agent.get_configs()["history"]) == 2
 
-    def test_invalid_agent_creation_fails(self):
-        with pytest.raises(InvalidAgentConfigException):
-            AIAgent(provider="openai", model="", name="Test", instructions="Test")
-
-        with pytest.raises(InvalidAgentConfigException):
-            AIAgent(provider="openai", model="gpt-5-mini", name="", instructions="Test")
-
-        with pytest.raises(InvalidAgentConfigException):
-            AIAgent(provider="openai", model="gpt-5-mini", name="Test", instructions="")
-
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    @pytest.mark.parametrize(
+        "model, name, instructions",
+        [
+            ("", "Test", "Test"),
+            ("gpt-5-mini", "", "Test"),
+            ("gpt-5-mini", "Test", ""),
+        ],
+        ids=["empty_model", "empty_name", "empty_instructions"],
     )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_chat_error_handling(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
-
-        ChatAdapterFactory.clear_cache()
+    def test_invalid_agent_creation_fails(self, model, name, instructions):
+        with pytest.raises(InvalidAgentConfigException):
+            AIAgent(
+                provider="openai", model=model, name=name, instructions=instructions
+            )
 
-        mock_get_api_key.return_value = "test-api-key"
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = RuntimeError("API Error")
-        mock_get_client.return_value = mock_client
+    def test_chat_error_handling(self, mock_openai_client):
+        mock_openai_client.chat.completions.create.side_effect = RuntimeError(
+            "API Error"
+        )
 
         agent = AIAgent(
             provider="openai", model="gpt-5-nano", name="Agent", instructions="Test"
@@ -184,30 +171,13 @@ class TestAgentIntegration:
         with pytest.raises(ChatException):
             agent.chat("Hello")
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_history_not_updated_on_error(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
-
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-api-key"
-        mock_client = Mock()
-
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Success"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
-
-        mock_client.chat.completions.create.side_effect = [
-            mock_response,
+    def test_history_not_updated_on_error(
+        self, mock_openai_client, make_openai_response
+    ):
+        mock_openai_client.chat.completions.create.side_effect = [
+            make_openai_response("Success"),
             RuntimeError("API Error"),
         ]
-        mock_get_client.return_value = mock_client
 
         agent = AIAgent(
             provider="openai", model="gpt-5-mini", name="Agent", instructions="Test"
@@ -221,59 +191,14 @@ class TestAgentIntegration:
 
         assert len(agent.get_configs()["history"]) == 2
 
-    @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_get_configs_returns_complete_info(self, mock_ollama_chat):
-        mock_ollama_chat.return_value = {"message": {"content": "Response"}}
-
-        agent = AIAgent(
-            provider="ollama",
-            model="phi4-mini:latest",
-            name="TestAgent",
-            instructions="Test instructions",
-        )
-
-        agent.chat("Test")
-
-        configs = agent.get_configs()
-
-        assert "name" in configs
-        assert "model" in configs
-        assert "instructions" in configs
-        assert "history" in configs
-        assert "provider" in configs
-        assert configs["name"] == "TestAgent"
-        assert configs["model"] == "phi4-mini:latest"
-        assert configs["instructions"] == "Test instructions"
-        assert configs["provider"] == "ollama"
-        assert len(configs["history"]) == 2
-
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_multiple_agents_are_independent(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
-
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-api-key"
-        mock_client = Mock()
-
-        def create_mock_response(content):
-            mock_response = Mock()
-            mock_message = Mock()
-            mock_message.content = content
-            mock_choice = Mock()
-            mock_choice.message = mock_message
-            mock_response.choices = [mock_choice]
-            return mock_response
-
-        mock_client.chat.completions.create.side_effect = [
-            create_mock_response("Response A1"),
-            create_mock_response("Response B1"),
-            create_mock_response("Response A2"),
+    def test_multiple_agents_are_independent(
+        self, mock_openai_client, make_openai_response
+    ):
+        mock_openai_client.chat.completions.create.side_effect = [
+            make_openai_response("Response A1"),
+            make_openai_response("Response B1"),
+            make_openai_response("Response A2"),
         ]
-        mock_get_client.return_value = mock_client
 
         agent_a = AIAgent(
             provider="openai",
@@ -301,25 +226,11 @@ class TestAgentIntegration:
         assert config_a["name"] == "Agent A"
         assert config_b["name"] == "Agent B"
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_empty_message_validation(self, mock_get_client, mock_get_api_key):
-        from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
-
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-api-key"
-        mock_client = Mock()
-        mock_get_client.return_value = mock_client
-
+    @pytest.mark.parametrize("message", ["", "   "], ids=["empty", "whitespace"])
+    def test_empty_message_validation(self, mock_openai_client, message):
         agent = AIAgent(
             provider="openai", model="gpt-5-nano", name="Agent", instructions="Test"
         )
 
         with pytest.raises(ValueError, match="mensagem não pode estar vazia"):
-            agent.chat("")
-
-        with pytest.raises(ValueError, match="mensagem não pode estar vazia"):
-            agent.chat("   ")
+            agent.chat(message)
@@ -1,49 +1,60 @@
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 import pytest
 
 from src.application.interfaces.chat_repository import ChatRepository
+from src.domain.exceptions import ChatException
 from src.infra.adapters.Ollama.ollama_chat_adapter import OllamaChatAdapter
 from src.infra.adapters.OpenAI.openai_chat_adapter import OpenAIChatAdapter
 from src.infra.factories.chat_adapter_factory import ChatAdapterFactory
 
+_OPENAI_ADAPTER = "src.infra.adapters.OpenAI.openai_chat_adapter"
+_OLLAMA_ADAPTER = "src.infra.adapters.Ollama.ollama_chat_adapter"
+
 
 @pytest.mark.integration
 class TestChatAdapterFactoryIntegration:
     """Testes de integração para ChatAdapterFactory."""
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    @pytest.fixture(autouse=True)
+    def mock_ollama_chat(self, patched_openai_client, monkeypatch):
+        """
+        Isola os dois providers em todos os testes da classe.
+
+        A API key e o cliente OpenAI vêm de patched_openai_client; a função
+        chat do Ollama é trocada por um Mock, devolvido para os testes que
+        verificam a chamada. Cada teste recebe um cache de adapters vazio e
+        exclusivo, restaurado no teardown, para que nenhum adapter criado
+        com esses patches vaze para outros módulos.
+        """
+        monkeypatch.setattr(ChatAdapterFactory, "_cache", {})
+        mock_chat = Mock(return_value={"message": {"content": "Ollama response"}})
+        monkeypatch.setattr(f"{_OLLAMA_ADAPTER}.chat", mock_chat)
+        return mock_chat
+
+    @pytest.mark.parametrize(
+        "model", ["gpt-5", "gpt-5-mini", "gpt-5-nano", "GPT-5-NANO"]
     )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_factory_creates_openai_adapter_for_gpt_models(
-        self, mock_get_client, mock_get_api_key
-    ):
-        mock_get_api_key.return_value = "test-key"
-        mock_client = Mock()
-        mock_get_client.return_value = mock_client
-
-        gpt_models = ["gpt-5", "gpt-5-mini", "gpt-5-nano", "GPT-5-NANO"]
-
-        for model in gpt_models:
-            adapter = ChatAdapterFactory.create(provider="openai", model=model)
-            assert isinstance(adapter, OpenAIChatAdapter)
-            assert isinstance(adapter, ChatRepository)
-
-    def test_factory_creates_ollama_adapter_for_non_gpt_models(self):
-        non_gpt_models = [
+    def test_factory_creates_openai_adapter_for_gpt_models(self, model):
+        adapter = ChatAdapterFactory.create(provider="openai", model=model)
+        assert isinstance(adapter, OpenAIChatAdapter)
+        assert isinstance(adapter, ChatRepository)
+
+    @pytest.mark.parametrize(
+        "model",
+        [
             "gemma3:4b",
             "phi4-mini:latest",
             "llama2",
             "mistral",
             "claude",
             "random-model",
-        ]
-
-        for model in non_gpt_models:
-            adapter = ChatAdapterFactory.create(provider="ollama", model=model)
-            assert isinstance(adapter, OllamaChatAdapter)
-            assert isinstance(adapter, ChatRepository)
+        ],
+    )
+    def test_factory_creates_ollama_adapter_for_non_gpt_models(self, model):
+        adapter = ChatAdapterFactory.create(provider="ollama", model=model)
+        assert isinstance(adapter, OllamaChatAdapter)
+        assert isinstance(adapter, ChatRepository)
 
     def test_factory_provider_selection(self):
         """Testa que factory respeita o parâmetro provider."""
@@ -55,27 +66,7 @@ class TestChatAdapterFactoryIntegration:
         # Tipos diferentes baseados no provider
         assert type(adapter_openai) != type(adapter_ollama)
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_factory_adapter_can_chat_openai(
-        self, mock_ollama, mock_get_client, mock_get_api_key
-    ):
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-key"
-        mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "OpenAI response"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
-        mock_client.chat.completions.create.return_value = mock_response
-        mock_get_client.return_value = mock_client
-
+    def test_factory_adapter_can_chat_openai(self, openai_client_mock):
         adapter = ChatAdapterFactory.create(provider="openai", model="gpt-5-mini")
 
         response = adapter.chat(
@@ -83,12 +74,9 @@ class TestChatAdapterFactoryIntegration:
         )
 
         assert response == "OpenAI response"
-        assert mock_client.chat.completions.create.called
+        assert openai_client_mock.chat.completions.create.called
 
-    @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
     def test_factory_adapter_can_chat_ollama(self, mock_ollama_chat):
-        mock_ollama_chat.return_value = {"message": {"content": "Ollama response"}}
-
         adapter = ChatAdapterFactory.create(provider="ollama", model="gemma3:4b")
 
         response = adapter.chat(
@@ -98,87 +86,26 @@ class TestChatAdapterFactoryIntegration:
         assert response == "Ollama response"
         assert mock_ollama_chat.called
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_factory_uses_cache_for_same_model(self, mock_get_client, mock_get_api_key):
-        mock_get_api_key.return_value = "test-key"
-        mock_client = Mock()
-        mock_get_client.return_value = mock_client
-
-        ChatAdapterFactory.clear_cache()
-
+    def test_factory_uses_cache_for_same_model(self):
         adapter1 = ChatAdapterFactory.create(provider="openai", model="gpt-5")
         adapter2 = ChatAdapterFactory.create(provider="openai", model="gpt-5")
 
         assert adapter1 is adapter2
 
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-    )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    def test_factory_creates_different_adapters_for_different_models(
-        self, mock_get_client, mock_get_api_key
-    ):
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-key"
-        mock_client = Mock()
-        mock_get_client.return_value = mock_client
-
-        ChatAdapterFactory.clear_cache()
-
+    def test_factory_creates_different_adapters_for_different_models(self):
         adapter1 = ChatAdapterFactory.create(provider="openai", model="gpt-5-mini")
         adapter2 = ChatAdapterFactory.create(provider="openai", model="gemma3:4b")
 
         assert adapter1 is not adapter2
 
-    def test_factory_case_insensitive_gpt_detection(self):
-        with patch(
-            "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-        ) as mock_key:
-            with patch(
-                "src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client"
-            ) as mock_client:
-                mock_key.return_value = "test-key"
-                mock_client.return_value = Mock()
-
-                ChatAdapterFactory.clear_cache()
-
-                case_variations = [
-                    "gpt-5",
-                    "GPT-5",
-                    "Gpt-5-mini",
-                    "GPT-5-NANO",
-                    "gpt-5-nano",
-                ]
-
-                for model in case_variations:
-                    adapter = ChatAdapterFactory.create(provider="openai", model=model)
-                    assert isinstance(adapter, OpenAIChatAdapter)
-
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+    @pytest.mark.parametrize(
+        "model", ["gpt-5", "GPT-5", "Gpt-5-mini", "GPT-5-NANO", "gpt-5-nano"]
     )
-    @patch("src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client")
-    @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_factory_adapter_handles_history(
-        self, mock_ollama, mock_get_client, mock_get_api_key
-    ):
-        ChatAdapterFactory.clear_cache()
-
-        mock_get_api_key.return_value = "test-key"
-        mock_client = Mock()
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Response with history"
-        mock_choice = Mock()
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
-        mock_client.chat.completions.create.return_value = mock_response
-        mock_get_client.return_value = mock_client
+    def test_factory_case_insensitive_gpt_detection(self, model):
+        adapter = ChatAdapterFactory.create(provider="openai", model=model)
+        assert isinstance(adapter, OpenAIChatAdapter)
 
+    def test_factory_adapter_handles_history(self, openai_client_mock):
         adapter = ChatAdapterFactory.create(provider="openai", model="gpt-5-nano")
 
         history = [
@@ -193,88 +120,66 @@ class TestChatAdapterFactoryIntegration:
             history=history,
         )
 
-        assert response == "Response with history"
+        assert response == "OpenAI response"
 
-        call_args = mock_client.chat.completions.create.call_args
+        call_args = openai_client_mock.chat.completions.create.call_args
         messages = call_args.kwargs["messages"]
         assert len(messages) >= 3  # system + history + user
 
-    @patch("src.infra.adapters.Ollama.ollama_chat_adapter.chat")
-    def test_factory_with_ollama_and_different_models(self, mock_ollama_chat):
-        mock_ollama_chat.return_value = {"message": {"content": "Local response"}}
-
-        models = ["gemma3:4b", "phi4-mini:latest", "llama2"]
-
-        for model in models:
-            adapter = ChatAdapterFactory.create(provider="ollama", model=model)
-            assert isinstance(adapter, OllamaChatAdapter)
+    @pytest.mark.parametrize("model", ["gemma3:4b", "phi4-mini:latest", "llama2"])
+    def test_factory_with_ollama_and_different_models(self, model):
+        adapter = ChatAdapterFactory.create(provider="ollama", model=model)
+        assert isinstance(adapter, OllamaChatAdapter)
 
-            response = adapter.chat(
-                model=model, instructions="Test", user_ask="Test", history=[]
-            )
+        response = adapter.chat(
+            model=model, instructions="Test", user_ask="Test", history=[]
+        )
 
-            assert response == "Local response"
+        assert response == "Ollama response"
 
-    def test_factory_returns_chat_repository_interface(self):
-        """Testa que factory retorna interface ChatRepository para todos os providers."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "provider, model",
+        [
             ("openai", "gpt-5-mini"),
             ("ollama", "gemma3:4b"),
             ("openai", "gpt-5-nano"),
             ("ollama", "phi4-mini:latest"),
-        ]
-
-        with patch(
-            "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-        ) as mock_key:
-            with patch(
-                "src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client"
-            ) as mock_client:
-                mock_key.return_value = "test-key"
-                mock_client.return_value = Mock()
-
-                for provider, model in test_cases:
-                    adapter = ChatAdapterFactory.create(provider=provider, model=model)
-                    assert isinstance(adapter, ChatRepository)
-                    assert hasattr(adapter, "chat")
-                    assert callable(adapter.chat)
-
-    @patch(
-        "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
+        ],
     )
-    def test_factory_handles_missing_api_key(self, mock_get_api_key):
-        from src.domain.exceptions import ChatException
+    def test_factory_returns_chat_repository_interface(self, provider, model):
+        """Testa que factory retorna interface ChatRepository para todos os providers."""
+        adapter = ChatAdapterFactory.create(provider=provider, model=model)
+        assert isinstance(adapter, ChatRepository)
+        assert hasattr(adapter, "chat")
+        assert callable(adapter.chat)
 
-        ChatAdapterFactory.clear_cache()
+    def test_factory_handles_missing_api_key(self, monkeypatch):
+        def missing_api_key(name):
+            raise EnvironmentError("API key not found")
 
-        mock_get_api_key.side_effect = EnvironmentError("API key not found")
+        monkeypatch.setattr(
+            f"{_OPENAI_ADAPTER}.EnvironmentConfig.get_api_key", missing_api_key
+        )
 
         with pytest.raises(ChatException, match="Erro ao configurar OpenAI"):
             ChatAdapterFactory.create(provider="openai", model="gpt-5-mini")
 
-    def test_factory_logic_consistency(self):
+    @pytest.mark.parametrize(
+        "provider, model, adapter_class",
+        [
+            ("ollama", "gemma3:4b", OllamaChatAdapter),
+            ("ollama", "phi4-mini:latest", OllamaChatAdapter),
+            ("ollama", "llama2", OllamaChatAdapter),
+            ("ollama", "any-model", OllamaChatAdapter),
+            ("openai", "gpt-5-mini", OpenAIChatAdapter),
+            ("openai", "gpt-5-nano", OpenAIChatAdapter),
+            ("openai", "gpt-4", OpenAIChatAdapter),
+            ("openai", "any-model", OpenAIChatAdapter),
+        ],
+    )
+    def test_factory_logic_consistency(self, provider, model, adapter_class):
         """Testa consistência na escolha de adapters baseado no provider."""
-        # Testa Ollama provider
-        ollama_models = ["gemma3:4b", "phi4-mini:latest", "llama2", "any-model"]
-        for model in ollama_models:
-            adapter = ChatAdapterFactory.create(provider="ollama", model=model)
-            assert isinstance(
-                adapter, OllamaChatAdapter
-            ), f"Model {model} with ollama provider should use OllamaChatAdapter"
-
-        # Testa OpenAI provider
-        with patch(
-            "src.infra.adapters.OpenAI.openai_chat_adapter.EnvironmentConfig.get_api_key"
-        ) as mock_key:
-            with patch(
-                "src.infra.adapters.OpenAI.openai_chat_adapter.ClientOpenAI.get_client"
-            ) as mock_client:
-                mock_key.return_value = "test-key"
-                mock_client.return_value = Mock()
-
-                openai_models = ["gpt-5-mini", "gpt-5-nano", "gpt-4", "any-model"]
-                for model in openai_models:
-                    adapter = ChatAdapterFactory.create(provider="openai", model=model)
-                    assert isinstance(
-                        adapter, OpenAIChatAdapter
-                    ), f"Model {model} with openai provider should use OpenAIChatAdapter"
+        adapter = ChatAdapterFactory.create(provider=provider, model=model)
+        assert isinstance(
+            adapter, adapter_class
+        ), f"Model {model} with {provider} provider should use {adapter_class.__name__}"
@@ -33,23 +33,27 @@ class TestAgentComposer:
 
         assert agent.provider == "ollama"
 
-    def test_create_agent_with_empty_model_raises_error(self):
-        with pytest.raises(InvalidAgentConfigException):
-            AgentComposer.create_agent(
-                provider="openai", model="", name="Test", instructions="Test"
-            )
-
-    def test_create_agent_with_empty_name_raises_error(self):
-        with pytest.raises(InvalidAgentConfigException):
-            AgentComposer.create_agent(
-                provider="openai", model="gpt-5-nano", name="", instructions="Test"
-            )
-
-    def test_create_agent_with_empty_instructions_raises_error(self):
-        with pytest.raises(InvalidAgentConfigException):
-            AgentComposer.create_agent(
-                provider="openai", model="gpt-5-nano", name="Test", instructions=""
-            )
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("model", ""),
+            ("name", ""),
+            ("instructions", ""),
+            ("name", "   "),
+        ],
+        ids=["empty_model", "empty_name", "empty_instructions", "blank_name"],
+    )
+    def test_create_agent_with_invalid_field_raises_error(self, field, value):
+        kwargs = {
+            "provider": "openai",
+            "model": "gpt-5-nano",
+            "name": "Test",
+            "instructions": "Test",
+        }
+        kwargs[field] = value
+
+        with pytest.raises(InvalidAgentConfigException, match=f"'{field}'"):
+            AgentComposer.create_agent(**kwargs)
 
     def test_create_chat_use_case_returns_use_case(self):
         use_case = AgentComposer.create_chat_use_case(
@@ -97,17 +101,3 @@ class TestAgentComposer:
         )
 
         assert use_case1 is not use_case2
-
-    def test_create_agent_wraps_exceptions_in_invalid_config(self):
-        with pytest.raises(InvalidAgentConfigException):
-            AgentComposer.create_agent(
-                provider="openai", model="gpt-5-nano", name="   ", instructions="Test"
-            )
-
-    def test_error_message_contains_composer_context(self):
-        try:
-            AgentComposer.create_agent(
-                provider="openai", model="", name="Test", instructions="Test"
-            )
-        except InvalidAgentConfigException:
-            pass
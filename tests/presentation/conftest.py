@@ -0,0 +1,223 @@
+"""
+Fixtures compartilhadas pelos testes da camada de apresentação.
+"""
+
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from src.infra.config.metrics import ChatMetrics
+from src.main.composers.agent_composer import AgentComposer
+from src.presentation.agent_controller import AIAgent
+
+
+def _make_use_case_mock(*, response=None, metrics=()) -> Mock:
+    """
+    Use case falso com as respostas pré-configuradas na construção.
+
+    Args:
+        response: Texto devolvido em execute().response
+        metrics: Métricas devolvidas por get_metrics()
+    """
+    return Mock(
+        **{
+            "execute.return_value": SimpleNamespace(response=response),
+            "get_metrics.return_value": list(metrics),
+        }
+    )
+
+
+@dataclass
+class PatchedComposer:
+    """Use cases falsos entregues pelo AgentComposer durante o teste."""
+
+    chat_use_case: Mock = field(default_factory=_make_use_case_mock)
+    config_use_case: Mock = field(default_factory=Mock)
+
+
+def _build_light_agent(**kwargs) -> AIAgent:
+    """
+    Constrói um AIAgent sem adapter de provider.
+
+    Os use cases são Mocks, então nenhum cliente OpenAI ou Ollama é
+    criado; serve aos testes que só exercitam o histórico do agente.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(AgentComposer, "create_chat_use_case", lambda **kw: Mock())
+        mp.setattr(AgentComposer, "create_get_config_use_case", lambda: Mock())
+        return AIAgent(**kwargs)
+
+
+class AgentPool:
+    """
+    Pool de AIAgent leves (sem adapter) reutilizáveis entre testes.
+
+    Agentes devolvidos têm o histórico limpo e voltam para a lista livre
+    da sua configuração; acquire() só constrói um novo se não houver
+    nenhum livre com os mesmos parâmetros. Se clear_history() não esvaziar
+    o histórico, o agente é descartado em vez de vazar para o próximo teste.
+    """
+
+    def __init__(self) -> None:
+        self._free: Dict[Tuple[Tuple[str, object], ...], List[AIAgent]] = {}
+        self._keys: Dict[int, Tuple[Tuple[str, object], ...]] = {}
+
+    def acquire(self, **kwargs) -> AIAgent:
+        key = tuple(sorted(kwargs.items()))
+        free = self._free.setdefault(key, [])
+        agent = free.pop() if free else _build_light_agent(**kwargs)
+        self._keys[id(agent)] = key
+        return agent
+
+    def release(self, agent: AIAgent) -> None:
+        key = self._keys.pop(id(agent))
+        agent.clear_history()
+        if len(agent._AIAgent__agent.history) == 0:
+            self._free[key].append(agent)
+
+
+@pytest.fixture(scope="class")
+def ai_agent_openai():
+    """
+    AIAgent OpenAI construído uma vez por classe de teste.
+
+    Só deve ser usado por testes que não alteram o agente; os que
+    alteram o histórico devem usar pooled_agent.
+
+    Returns:
+        AIAgent: Controller com provider "openai" e modelo "gpt-5-nano"
+    """
+    return AIAgent(
+        provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
+    )
+
+
+@pytest.fixture(scope="class")
+def light_controller():
+    """
+    AIAgent sem adapter de provider, construído uma vez por classe.
+
+    Só deve ser usado por testes que não alteram o agente.
+
+    Returns:
+        AIAgent: Controller com use cases falsos
+    """
+    return _build_light_agent(
+        provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
+    )
+
+
+@pytest.fixture
+def make_light_agent():
+    """
+    Constrói AIAgents leves novos, fora do pool.
+
+    Para testes que precisam de uma configuração própria ou que não
+    podem depender do clear_history() usado pelo pool.
+
+    Returns:
+        Callable[..., AIAgent]: Recebe os kwargs do AIAgent
+    """
+    return _build_light_agent
+
+
+@pytest.fixture(scope="session")
+def agent_pool():
+    """
+    Pool de agentes compartilhado pela sessão.
+
+    Returns:
+        AgentPool: Pool vazio; os agentes são criados sob demanda
+    """
+    return AgentPool()
+
+
+@pytest.fixture
+def pooled_agent(agent_pool):
+    """
+    AIAgent leve retirado do pool e devolvido com o histórico limpo.
+
+    Yields:
+        AIAgent: Controller com provider "openai" e modelo "gpt-5-nano"
+    """
+    agent = agent_pool.acquire(
+        provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
+    )
+    yield agent
+    agent_pool.release(agent)
+
+
+@pytest.fixture
+def patched_composer(monkeypatch):
+    """
+    Faz o AgentComposer do controller devolver use cases falsos.
+
+    Só os testes que pedem a fixture são afetados; os agentes
+    compartilhados por classe ou sessão não usam estes mocks.
+
+    Returns:
+        PatchedComposer: Mocks de chat e de configuração, novos por teste
+    """
+    mocks = PatchedComposer()
+    monkeypatch.setattr(
+        AgentComposer, "create_chat_use_case", lambda **kwargs: mocks.chat_use_case
+    )
+    monkeypatch.setattr(
+        AgentComposer, "create_get_config_use_case", lambda: mocks.config_use_case
+    )
+    return mocks
+
+
+@pytest.fixture
+def make_chat_mock(patched_composer):
+    """
+    Configura a resposta do use case de chat entregue pelo composer.
+
+    Returns:
+        Callable[..., Mock]: Recebe o texto da resposta e as métricas e
+        devolve o use case de chat já configurado
+    """
+
+    def configure(response: str = "Response", metrics=()) -> Mock:
+        patched_composer.chat_use_case = _make_use_case_mock(
+            response=response, metrics=metrics
+        )
+        return patched_composer.chat_use_case
+
+    return configure
+
+
+@pytest.fixture(scope="session")
+def sample_metrics():
+    """
+    Métricas de exemplo compartilhadas pela sessão.
+
+    ChatMetrics é imutável (frozen), então as mesmas instâncias servem
+    a todos os testes.
+
+    Returns:
+        Tuple[ChatMetrics, ...]: Só latência; latência e tokens
+    """
+    return (
+        ChatMetrics(model="gpt-5-nano", latency_ms=100.0),
+        ChatMetrics(model="gpt-5-nano", latency_ms=100.0, tokens_used=50),
+    )
+
+
+@pytest.fixture(scope="module")
+def metrics_controller(sample_metrics):
+    """
+    AIAgent cujo use case reporta uma métrica fixa; só leitura.
+
+    Returns:
+        AIAgent: Controller com get_metrics() devolvendo latência e tokens
+    """
+    mock_use_case = _make_use_case_mock(metrics=sample_metrics[1:])
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(AgentComposer, "create_chat_use_case", lambda **kw: mock_use_case)
+        return AIAgent(
+            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
+        )
@@ -1,55 +1,92 @@
-from unittest.mock import Mock, patch
+from operator import attrgetter
+from types import SimpleNamespace
 
 import pytest
 
 from src.domain.exceptions import InvalidAgentConfigException
 from src.presentation.agent_controller import AIAgent
 
+# Dependências que o __init__ do AIAgent deve criar
+_CONTROLLER_ATTRS = (
+    "_AIAgent__agent",
+    "_AIAgent__chat_use_case",
+    "_AIAgent__get_config_use_case",
+)
+
+# (kwargs do AIAgent, atributos esperados no Agent criado); name e
+# instructions são fixos no teste. Chaves aceitam caminho com ponto.
+_INIT_CASES = [
+    pytest.param(
+        {"provider": "openai", "model": "gpt-5"},
+        {"provider": "openai", "model": "gpt-5", "name": "Test"},
+        id="openai_provider",
+    ),
+    pytest.param(
+        {"provider": "ollama", "model": "gemma3:4b"},
+        {"provider": "ollama", "model": "gemma3:4b", "instructions": "Test"},
+        id="ollama_provider",
+    ),
+    pytest.param(
+        {"provider": "openai", "model": "gpt-5-nano"},
+        {"history.MAX_SIZE": 10},
+        id="default_history_max_size",
+    ),
+    pytest.param(
+        {"provider": "openai", "model": "gpt-5-nano", "history_max_size": 3},
+        {"history.MAX_SIZE": 3},
+        id="custom_history_max_size",
+    ),
+]
+
+
+# (método de exportação, arquivo de destino, trecho esperado no conteúdo)
+_EXPORTERS = [
+    pytest.param("export_metrics_json", "metrics.json", '"summary"', id="json"),
+    pytest.param(
+        "export_metrics_prometheus",
+        "metrics.prom",
+        "chat_requests_total",
+        id="prometheus",
+    ),
+]
+
+
+def _fill_and_clear_history(controller, index):
+    """Adiciona uma troca de mensagens ao histórico e o limpa em seguida."""
+    agent = controller._AIAgent__agent
+    agent.add_user_message(f"Message {index}")
+    agent.add_assistant_message(f"Response {index}")
+    assert len(agent.history) > 0
+
+    controller.clear_history()
+    assert len(agent.history) == 0
+
 
 @pytest.mark.unit
 class TestAIAgent:
-    def test_initialization_creates_agent(self):
-        controller = AIAgent(
-            provider="openai",
-            model="gpt-5",
-            name="Test Agent",
-            instructions="Be helpful",
-        )
-
-        assert hasattr(controller, "_AIAgent__agent")
-
-    def test_initialization_with_ollama_provider(self):
-        controller = AIAgent(
-            provider="ollama", model="gemma3:4b", name="Test", instructions="Test"
-        )
-
-        assert hasattr(controller, "_AIAgent__agent")
+    @pytest.mark.init
+    def test_initialization_creates_dependencies(self, ai_agent_openai):
+        missing = [a for a in _CONTROLLER_ATTRS if a not in vars(ai_agent_openai)]
 
-    def test_initialization_creates_chat_use_case(self):
-        controller = AIAgent(
-            provider="openai", model="gpt-5-mini", name="Test", instructions="Test"
-        )
+        assert missing == []
 
-        assert hasattr(controller, "_AIAgent__chat_use_case")
-
-    def test_initialization_creates_get_config_use_case(self):
-        controller = AIAgent(
-            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
-        )
+    @pytest.mark.init
+    @pytest.mark.parametrize("kwargs, expected_attrs", _INIT_CASES)
+    def test_initialization_configures_agent(self, kwargs, expected_attrs):
+        controller = AIAgent(name="Test", instructions="Test", **kwargs)
 
-        assert hasattr(controller, "_AIAgent__get_config_use_case")
+        agent = controller._AIAgent__agent
+        for attr, value in expected_attrs.items():
+            assert attrgetter(attr)(agent) == value, attr
 
+    @pytest.mark.init
     def test_initialization_with_invalid_data_raises_error(self):
         with pytest.raises(InvalidAgentConfigException):
             AIAgent(provider="openai", model="", name="Test", instructions="Test")
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_chat_returns_response(self, mock_create_chat):
-        mock_use_case = Mock()
-        mock_output = Mock()
-        mock_output.response = "AI response"
-        mock_use_case.execute.return_value = mock_output
-        mock_create_chat.return_value = mock_use_case
+    @pytest.mark.chat
+    def test_chat_returns_response(self, make_chat_mock):
+        make_chat_mock("AI response")
 
         controller = AIAgent(
             provider="openai", model="gpt-5", name="Test", instructions="Test"
@@ -59,13 +96,9 @@ class TestAIAgent:
 
         assert response == "AI response"
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_chat_calls_use_case_with_correct_params(self, mock_create_chat):
-        mock_use_case = Mock()
-        mock_output = Mock()
-        mock_output.response = "Response"
-        mock_use_case.execute.return_value = mock_output
-        mock_create_chat.return_value = mock_use_case
+    @pytest.mark.chat
+    def test_chat_calls_use_case_with_correct_params(self, make_chat_mock):
+        mock_use_case = make_chat_mock()
 
         controller = AIAgent(
             provider="openai", model="gpt-5-mini", name="Test", instructions="Test"
@@ -77,19 +110,36 @@ class TestAIAgent:
         call_args = mock_use_case.execute.call_args
         assert call_args[0][1].message == "Test message"
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_get_config_use_case")
-    def test_get_configs_returns_dict(self, mock_create_config):
-        mock_use_case = Mock()
-        mock_output = Mock()
-        mock_output.to_dict.return_value = {
+    @pytest.mark.chat
+    @pytest.mark.parametrize(
+        "message, expected_response",
+        [("", "Response"), ("你好，世界！ 🌍", "回复"), ("A" * 256, "Response")],
+        ids=["empty", "unicode", "long"],
+    )
+    def test_chat_passes_message_through(
+        self, make_chat_mock, message, expected_response
+    ):
+        mock_use_case = make_chat_mock(expected_response)
+
+        controller = AIAgent(
+            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
+        )
+
+        response = controller.chat(message)
+
+        assert response == expected_response
+        assert mock_use_case.execute.call_args[0][1].message == message
+
+    def test_get_configs_returns_dict(self, patched_composer):
+        mock_use_case = patched_composer.config_use_case
+        configs = {
             "name": "Test",
             "model": "gpt-5-nano",
             "instructions": "Test",
             "history": [],
             "provider": "openai",
         }
-        mock_use_case.execute.return_value = mock_output
-        mock_create_config.return_value = mock_use_case
+        mock_use_case.execute.return_value = SimpleNamespace(to_dict=lambda: configs)
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -101,13 +151,9 @@ class TestAIAgent:
         assert "name" in config
         assert "model" in config
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_get_config_use_case")
-    def test_get_configs_calls_use_case(self, mock_create_config):
-        mock_use_case = Mock()
-        mock_output = Mock()
-        mock_output.to_dict.return_value = {}
-        mock_use_case.execute.return_value = mock_output
-        mock_create_config.return_value = mock_use_case
+    def test_get_configs_calls_use_case(self, patched_composer):
+        mock_use_case = patched_composer.config_use_case
+        mock_use_case.execute.return_value = SimpleNamespace(to_dict=dict)
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -117,60 +163,25 @@ class TestAIAgent:
 
         assert mock_use_case.execute.called
 
-    def test_multiple_chat_calls(self):
-        with patch(
-            "src.presentation.agent_controller.AgentComposer.create_chat_use_case"
-        ) as mock:
-            mock_use_case = Mock()
-            mock_output = Mock()
-            mock_output.response = "Response"
-            mock_use_case.execute.return_value = mock_output
-            mock.return_value = mock_use_case
-
-            controller = AIAgent(
-                provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
-            )
-
-            controller.chat("Message 1")
-            controller.chat("Message 2")
-
-            assert mock_use_case.execute.call_count == 2
-
-    def test_controller_manages_agent_state(self):
-        with patch(
-            "src.presentation.agent_controller.AgentComposer.create_chat_use_case"
-        ) as mock_chat:
-            with patch(
-                "src.presentation.agent_controller.AgentComposer.create_get_config_use_case"
-            ) as mock_config:
-                mock_chat_use_case = Mock()
-                mock_config_use_case = Mock()
-                mock_chat.return_value = mock_chat_use_case
-                mock_config.return_value = mock_config_use_case
-
-                controller = AIAgent(
-                    provider="openai",
-                    model="gpt-5-nano",
-                    name="Test",
-                    instructions="Test",
-                )
-
-                assert hasattr(controller, "_AIAgent__agent")
-                assert hasattr(controller, "_AIAgent__chat_use_case")
-                assert hasattr(controller, "_AIAgent__get_config_use_case")
-
-    def test_clear_history_method_exists(self):
+    @pytest.mark.chat
+    def test_multiple_chat_calls(self, make_chat_mock):
+        mock_use_case = make_chat_mock()
+
         controller = AIAgent(
-            provider="openai", model="gpt-5-mini", name="Test", instructions="Test"
+            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
         )
 
-        assert hasattr(controller, "clear_history")
-        assert callable(controller.clear_history)
+        controller.chat("Message 1")
+        controller.chat("Message 2")
 
-    def test_clear_history_clears_agent_history(self):
-        controller = AIAgent(
-            provider="openai", model="gpt-5-mini", name="Test", instructions="Test"
-        )
+        assert mock_use_case.execute.call_count == 2
+
+    def test_clear_history_method_exists(self, light_controller):
+        assert hasattr(light_controller, "clear_history")
+        assert callable(light_controller.clear_history)
+
+    def test_clear_history_clears_agent_history(self, pooled_agent):
+        controller = pooled_agent
 
         agent = controller._AIAgent__agent
         agent.add_user_message("Message 1")
@@ -184,71 +195,43 @@ class TestAIAgent:
 
         assert len(agent.history) == 0
 
-    def test_clear_history_preserves_agent_config(self):
-        controller = AIAgent(
+    def test_clear_history_preserves_agent_config(self, make_light_agent):
+        controller = make_light_agent(
             provider="ollama",
             model="gpt-5-nano",
             name="Test Agent",
             instructions="Be helpful",
         )
-
-        agent = controller._AIAgent__agent
-        original_model = agent.model
-        original_name = agent.name
-        original_instructions = agent.instructions
-        original_provider = agent.provider
-
-        controller.clear_history()
-
-        assert agent.model == original_model
-        assert agent.name == original_name
-        assert agent.instructions == original_instructions
-        assert agent.provider == original_provider
-
-    def test_clear_history_can_be_called_multiple_times(self):
-        controller = AIAgent(
-            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
-        )
-
         agent = controller._AIAgent__agent
         agent.add_user_message("Message 1")
         agent.add_assistant_message("Response 1")
-        assert len(controller._AIAgent__agent.history) > 0
 
         controller.clear_history()
-        assert len(controller._AIAgent__agent.history) == 0
-
-        agent.add_user_message("Message 2")
-        agent.add_assistant_message("Response 2")
-        assert len(controller._AIAgent__agent.history) > 0
 
-        controller.clear_history()
-        assert len(controller._AIAgent__agent.history) == 0
+        assert len(agent.history) == 0
+        assert agent.model == "gpt-5-nano"
+        assert agent.name == "Test Agent"
+        assert agent.instructions == "Be helpful"
+        assert agent.provider == "ollama"
 
-    def test_clear_history_on_empty_history(self):
-        controller = AIAgent(
-            provider="openai", model="gpt-5-mini", name="Test", instructions="Test"
-        )
+    @pytest.mark.parametrize("n_cycles", [1, 3, 10])
+    def test_clear_history_can_be_called_multiple_times(self, pooled_agent, n_cycles):
+        for i in range(n_cycles):
+            _fill_and_clear_history(pooled_agent, i)
 
-        assert len(controller._AIAgent__agent.history) == 0
+    def test_clear_history_on_empty_history(self, light_controller):
+        assert len(light_controller._AIAgent__agent.history) == 0
 
-        controller.clear_history()
+        light_controller.clear_history()
 
-        assert len(controller._AIAgent__agent.history) == 0
+        assert len(light_controller._AIAgent__agent.history) == 0
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    @patch("src.presentation.agent_controller.AgentComposer.create_get_config_use_case")
     def test_get_configs_after_clear_history_shows_empty_history(
-        self, mock_create_config, mock_create_chat
+        self, patched_composer, make_chat_mock
     ):
-        mock_chat_use_case = Mock()
-        mock_output = Mock()
-        mock_output.response = "Response"
-        mock_chat_use_case.execute.return_value = mock_output
-        mock_create_chat.return_value = mock_chat_use_case
+        make_chat_mock()
 
-        mock_config_use_case = Mock()
-        mock_create_config.return_value = mock_config_use_case
+        mock_config_use_case = patched_composer.config_use_case
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -265,17 +248,17 @@ class TestAIAgent:
         assert len(agent_passed.history) == 0
 
 
+@pytest.fixture(scope="module")
+def metrics_tmp(tmp_path_factory):
+    """Diretório temporário único para os testes de exportação do módulo."""
+    return tmp_path_factory.mktemp("metrics")
+
+
 @pytest.mark.unit
+@pytest.mark.metrics
 class TestAIAgentMetrics:
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_get_metrics_returns_list(self, mock_create_chat):
-        from src.infra.config.metrics import ChatMetrics
-
-        mock_use_case = Mock()
-        mock_use_case.get_metrics.return_value = [
-            ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
-        ]
-        mock_create_chat.return_value = mock_use_case
+    def test_get_metrics_returns_list(self, make_chat_mock, sample_metrics):
+        make_chat_mock(metrics=sample_metrics[:1])
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -286,11 +269,8 @@ class TestAIAgentMetrics:
         assert isinstance(metrics, list)
         assert len(metrics) == 1
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_get_metrics_when_adapter_has_no_metrics(self, mock_create_chat):
-        mock_use_case = Mock()
-        mock_use_case.get_metrics.return_value = []
-        mock_create_chat.return_value = mock_use_case
+    def test_get_metrics_when_adapter_has_no_metrics(self, make_chat_mock):
+        make_chat_mock(metrics=[])
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -300,15 +280,8 @@ class TestAIAgentMetrics:
 
         assert metrics == []
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_export_metrics_json(self, mock_create_chat):
-        from src.infra.config.metrics import ChatMetrics
-
-        mock_use_case = Mock()
-        mock_use_case.get_metrics.return_value = [
-            ChatMetrics(model="gpt-5-nano", latency_ms=100.0, tokens_used=50)
-        ]
-        mock_create_chat.return_value = mock_use_case
+    def test_export_metrics_json(self, make_chat_mock, sample_metrics):
+        make_chat_mock(metrics=sample_metrics[1:])
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -319,41 +292,30 @@ class TestAIAgentMetrics:
         assert isinstance(json_str, str)
         assert "gpt-5-nano" in json_str
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_export_metrics_json_to_file(self, mock_create_chat, tmp_path):
-        import json
-
-        from src.infra.config.metrics import ChatMetrics
-
-        mock_use_case = Mock()
-        mock_use_case.get_metrics.return_value = [
-            ChatMetrics(model="gpt-5-nano", latency_ms=100.0, tokens_used=50)
-        ]
-        mock_create_chat.return_value = mock_use_case
-
-        controller = AIAgent(
-            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
-        )
+    @pytest.mark.parametrize("exporter, filename, probe", _EXPORTERS)
+    def test_export_metrics_to_file(
+        self, metrics_controller, metrics_tmp, exporter, filename, probe
+    ):
+        filepath = metrics_tmp / filename
 
-        filepath = tmp_path / "metrics.json"
-        controller.export_metrics_json(str(filepath))
+        exported = getattr(metrics_controller, exporter)(str(filepath))
 
-        assert filepath.exists()
+        assert filepath.read_text(encoding="utf-8") == exported
+        assert probe in exported
 
-        with open(filepath, "r") as f:
-            data = json.load(f)
+    @pytest.mark.parametrize("exporter, filename, probe", _EXPORTERS)
+    def test_export_metrics_to_missing_directory_raises_error(
+        self, metrics_controller, metrics_tmp, exporter, filename, probe
+    ):
+        filepath = metrics_tmp / "missing" / filename
 
-        assert "summary" in data
+        with pytest.raises(FileNotFoundError):
+            getattr(metrics_controller, exporter)(str(filepath))
 
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_export_metrics_prometheus(self, mock_create_chat):
-        from src.infra.config.metrics import ChatMetrics
+        assert not filepath.parent.exists()
 
-        mock_use_case = Mock()
-        mock_use_case.get_metrics.return_value = [
-            ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
-        ]
-        mock_create_chat.return_value = mock_use_case
+    def test_export_metrics_prometheus(self, make_chat_mock, sample_metrics):
+        make_chat_mock(metrics=sample_metrics[:1])
 
         controller = AIAgent(
             provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
@@ -363,27 +325,3 @@ class TestAIAgentMetrics:
 
         assert isinstance(prom_text, str)
         assert "chat_requests_total" in prom_text
-
-    @patch("src.presentation.agent_controller.AgentComposer.create_chat_use_case")
-    def test_export_metrics_prometheus_to_file(self, mock_create_chat, tmp_path):
-        from src.infra.config.metrics import ChatMetrics
-
-        mock_use_case = Mock()
-        mock_use_case.get_metrics.return_value = [
-            ChatMetrics(model="gpt-5-nano", latency_ms=100.0)
-        ]
-        mock_create_chat.return_value = mock_use_case
-
-        controller = AIAgent(
-            provider="openai", model="gpt-5-nano", name="Test", instructions="Test"
-        )
-
-        filepath = tmp_path / "metrics.prom"
-        controller.export_metrics_prometheus(str(filepath))
-
-        assert filepath.exists()
-
-        with open(filepath, "r") as f:
-            content = f.read()
-
-        assert "chat_requests_total" in content